@@ -15,6 +15,7 @@ from hailo_apps_infra.hailo_rpi_common import (
     app_callback_class,
 )
 from hailo_apps_infra.pose_estimation_pipeline import GStreamerPoseEstimationApp
+from text_cache import TextCache
 
 # Initialize GStreamer and Pygame
 Gst.init(None)
@@ -26,7 +27,7 @@ HALF_SCREEN_WIDTH = SCREEN_WIDTH // 2
 pygame.display.set_caption("Enhanced Pose Estimation with Audio")
 
 clock = pygame.time.Clock()
-font = pygame.font.Font(None, 36)
+texts = TextCache()  # HUD strings are rasterised once, not every frame
 is_fullscreen = True
 
 # Colors
@@ -95,11 +96,11 @@ def draw_trail(screen, trail, color):
 def display_visual_name(name, is_default=False):
     if is_default:
         name += " - Single Person"
-    text_surface = font.render(name, True, TEXT_COLOR)
+    text_surface = texts.render(name, TEXT_COLOR)
     screen.blit(text_surface, (20, 20))
 
 def display_mode_text(mode_name):
-    text_surface = font.render(mode_name, True, TEXT_COLOR)
+    text_surface = texts.render(mode_name, TEXT_COLOR)
     x = SCREEN_WIDTH - text_surface.get_width() - 20
     screen.blit(text_surface, (x, 20))
 
@@ -4,11 +4,30 @@
 import gi
 gi.require_version("Gst", "1.0")
 from gi.repository import Gst
-import os, threading, importlib.util, cv2, numpy as np, pygame, hailo
+import os, time, threading, numpy as np, pygame, hailo
 from hailo_apps_infra.hailo_rpi_common import (
     get_caps_from_pad, get_numpy_from_buffer, app_callback_class
 )
 from hailo_apps_infra.pose_estimation_pipeline import GStreamerPoseEstimationApp
+from frame_slot import FrameSlot
+from camera_panel import CameraPanel
+from pose_frame import NUM_KP, decode_detections
+from tracker import Tracker
+from smoothing import OneEuro
+from prediction import ConstantVelocity
+from kinematics import Kinematics
+from tracks import TrackRegistry
+from trail_buffer import TrailMap, to_screen
+from polyline import PolylineRenderer
+from scheduler import Ema, PoseClock, RateMeter, RenderView, display_hz
+from snapshot import SnapshotBox
+from text_cache import Hud, TextCache
+from audio_engine import VoicePool
+from modulation import Modulator, load_matrix
+from loudness import LoudnessIndex
+from visual_registry import VisualRegistry
+from plugin_watch import PluginWatcher
+from visual_api import Visual
 
 # ────────── init ──────────
 Gst.init(None)
@@ -19,61 +38,51 @@ screen          = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
 SCREEN_W, SCREEN_H = screen.get_size()
 HALF_W          = SCREEN_W // 2
 clock           = pygame.time.Clock()
-font            = pygame.font.Font(None, 36)
+camera          = CameraPanel()
+polylines       = PolylineRenderer()
+texts           = TextCache()
 
 # ────────── constants ──────────
 BG, TXT          = (0, 0, 0), (255, 255, 0)
 LEFT_CLR, RIGHT_CLR = (0, 255, 0), (0, 0, 255)
+HUD_SIZE         = 36
 BBOX_CLR         = (255, 255, 0)
 CONF_THR         = 0.5
 TRAIL_LEN        = 30
+WRISTS           = (9, 10)         # left, right – see KEYPOINTS
+TRAIL_FADE       = 0               # faded bands behind the newest part of a trail
+RENDER_HZ        = display_hz()    # render cap (60 on pygame 2.6, see display_hz); inference runs at camera rate
+POSE_MODE        = "predict"       # or "interpolate" / "extrapolate" – see scheduler.PoseClock
+PREDICT_HORIZON  = 0.10            # furthest (s) a pose is projected past its capture time
+MAX_VOICES       = 6               # concurrent people with sound
+MOD_CFG          = "modulation.json"   # per-visual motion → sound mappings
+SMOOTH_MIN_CUTOFF = 1.0            # One-Euro cutoff (Hz) of a still keypoint – scalar or 17 values
+SMOOTH_BETA      = (4,)*7+(8,)*4+(4,)*4+(8,)*2   # cutoff rise with speed; limbs (elbows, wrists, ankles) track faster
 
 # ────────── globals ──────────
-visuals, visual_names = [], []
+visuals, visual_names = None, []  # VisualRegistry (built in load_visuals), its names
+watcher   = None                   # PluginWatcher – hot reload of edited visuals
 cur_vis   = 0
 mode      = 1                      # 0 visual | 1 split | 2 frame+keypts
 tutorial_sound_on = True
 
-audio_pipelines = {}               # pid → (pl, pitch, eq, vol, pan, file)
+voices          = VoicePool(MAX_VOICES)   # built once, reassigned per person
 cur_sound       = None
+mod_matrix      = load_matrix(os.path.join(os.path.dirname(os.path.abspath(__file__)),MOD_CFG))
+modulator       = None             # Modulator of the visual whose sound is playing
+loudness        = LoudnessIndex()  # LUFS per WAV, cached next to the sounds
 welcome_pipeline = None
 welcome_played   = False
 
 # ────────── audio helpers ──────────
 def sound_path(idx:int)->str|None:
-    stem = visual_names[idx].replace(' ', '') + "Visual.wav"
-    p = os.path.join(os.getcwd(), "normalized_sounds", stem)
+    p = os.path.join(os.getcwd(), "normalized_sounds", visuals.infos[idx].sound)
     return p if os.path.exists(p) else None
 
-def make_audio(sound_file:str, pid:str, xpos:float):
-    pl = Gst.Pipeline.new(pid)
-    mk = lambda name: Gst.ElementFactory.make(name, None)
-    fs, dec  = mk("filesrc"), mk("decodebin")
-    ac, ar   = mk("audioconvert"), mk("audioresample")
-    pitch, pan = mk("pitch"), mk("audiopanorama")
-    eq, vol, sink = mk("equalizer-10bands"), mk("volume"), mk("autoaudiosink")
-    for e in (fs, dec, ac, ar, pitch, pan, eq, vol, sink): pl.add(e)
-    fs.set_property("location", sound_file)
-    fs.link(dec)
-    dec.connect("pad-added", lambda _, p: p.link(ac.get_static_pad("sink")))
-    ac.link(ar); ar.link(pitch); pitch.link(pan)
-    pan.link(eq); eq.link(vol); vol.link(sink)
-
-    vis = visual_names[cur_vis]
-    if vis == "FeetHeatmap": eq.set_property("band0", 6.0); eq.set_property("band1", 6.0)
-    elif vis == "HipCircles": vol.set_property("volume", 0.8)
-    elif vis == "Skeleton": pitch.set_property("pitch", 1.05)
-
-    pan.set_property("panorama", 2*xpos - 1)
-    def bus_cb(_, msg):
-        if msg.type == Gst.MessageType.EOS:
-            pl.seek_simple(Gst.Format.TIME, Gst.SeekFlags.FLUSH|Gst.SeekFlags.KEY_UNIT, 0)
-        elif msg.type == Gst.MessageType.ERROR:
-            pl.set_state(Gst.State.NULL)
-    pl.get_bus().add_signal_watch()
-    pl.get_bus().connect("message", bus_cb)
-    pl.set_state(Gst.State.PLAYING)
-    return pl, pitch, eq, vol, pan, sound_file
+def warm_sound(info):
+    """Convert the PCM and measure (or load cached) loudness of a visual's sound – warm-up thread."""
+    p=os.path.join(os.getcwd(),"normalized_sounds",info.sound)
+    if os.path.exists(p): voices.prepare(p); loudness.lufs(p); loudness.save()
 
 def play_once(path:str):
     global welcome_pipeline
@@ -87,80 +96,92 @@ def play_once(path:str):
 # ────────── draw helpers ──────────
 def draw_trails(surf, trails:dict):
     surf.fill(BG); w,h = surf.get_size()
-    for kpmap in trails.values():
-        for key,col in (("left_wrist",LEFT_CLR),("right_wrist",RIGHT_CLR)):
-            seq=kpmap.get(key,[])
-            if len(seq)<2: continue
-            pts=[(int(x*w),int(y*h)) for x,y in seq]
-            pygame.draw.lines(surf,col,False,pts,5)
+    lines=[(to_screen(kpmap[k],w,h),col) for kpmap in trails.values()
+           for k,col in zip(WRISTS,(LEFT_CLR,RIGHT_CLR)) if k in kpmap]
+    polylines.draw(surf,lines,5,TRAIL_FADE,BG)
 
-def split_screen(ud):
-    screen.fill(BG)
-    left = screen.subsurface((0,0,HALF_W,SCREEN_H)); left.fill(BG)
-    visuals[cur_vis].visualize(ud,left)
+def draw_visual(view,rect,now):
+    surf=screen.subsurface(rect); v=visuals.get(cur_vis)
+    if isinstance(v,Visual): v.draw(surf,now)
+    else: surf.fill(BG); v.visualize(view,surf)      # legacy visualize(user_data, surface)
 
-    if ud.frame is not None:
-        frm=cv2.flip(cv2.resize(ud.frame,(HALF_W,SCREEN_H)),1)
-        screen.blit(pygame.surfarray.make_surface(np.rot90(frm)),(HALF_W,0))
-        for d in ud.detections:
-            if d.get_label()!="person" or d.get_confidence()<CONF_THR: continue
-            b=d.get_bbox()
-            x1=HALF_W+int(b.xmin()*HALF_W); y1=int(b.ymin()*SCREEN_H)
-            x2=HALF_W+int(b.xmax()*HALF_W); y2=int(b.ymax()*SCREEN_H)
-            pygame.draw.rect(screen,BBOX_CLR,(x1,y1,x2-x1,y2-y1),2)
+def draw_camera(view,rect,show_kp=False):
+    x0,_,w,h=rect; screen.fill(BG,rect)
+    if view.frame is None: return
+    screen.blit(camera.render(view.frame,(w,h)),(x0,0))
+    pose=view.frame_pose          # captured with the frame; the resampled pose runs ahead of it
+    for x1,y1,x2,y2 in (pose.bboxes*(w,h,w,h)).astype(int).tolist():
+        pygame.draw.rect(screen,BBOX_CLR,(x0+x1,y1,x2-x1,y2-y1),2)
+    if show_kp:
+        pts=pose.keypoints[:,:,:2].reshape(-1,2); pts=pts[np.isfinite(pts).all(-1)]   # undecoded keypoints are NaN
+        for x,y in (pts*(w,h)).astype(int).tolist():
+            pygame.draw.circle(screen,(255,0,0),(x0+x,y),3)
 
-def txt(t,x=20,y=20):
-    screen.blit(font.render(t,True,TXT),(x,y))
+def needed_keypoints(all_kp:bool)->tuple|None:
+    """Keypoints gst_cb must decode: current visual ∪ trails ∪ modulation sources; None = all."""
+    need=visuals.infos[cur_vis].required_keypoints
+    if all_kp or not need: return None
+    need=set(need)|set(WRISTS)
+    for m in mod_matrix.get(visual_names[cur_vis],mod_matrix["default"]): need.update(m.kps)
+    return tuple(sorted(need)) if len(need)<NUM_KP else None
+
+def animating(v)->bool:
+    """Visuals that change without new poses (pulses, decay, evicted tracks)."""
+    f=getattr(v,"animating",None)
+    return bool(getattr(v,"stale",False) or (f and f()))
 
 # ────────── gst callback ──────────
+def buffer_time(pad,buf)->float:
+    """Capture time of buf on the time.monotonic() clock, from its PTS."""
+    now=time.monotonic()
+    el=pad.get_parent_element(); clk=el.get_clock() if el else None
+    if clk is None or buf.pts==Gst.CLOCK_TIME_NONE: return now
+    return now-max(0,clk.get_time()-el.get_base_time()-buf.pts)/Gst.SECOND
+
 def gst_cb(pad,info,ud):
     buf=info.get_buffer(); ud.increment()
+    t=buffer_time(pad,buf); ud.infer_rate.tick(t)
     fmt,w,h=get_caps_from_pad(pad)
-    if fmt and w and h:
-        ud.set_frame(cv2.cvtColor(get_numpy_from_buffer(buf,fmt,w,h),cv2.COLOR_RGB2BGR))
+    # frames are only shown in modes 1/2; pygame wants RGB, so no cvtColor
+    if mode and fmt and w and h:
+        ud.set_frame(get_numpy_from_buffer(buf,fmt,w,h))
+    v,need=ud.consumer             # one read: the keypoints decoded are the ones v reads
     roi = hailo.get_roi_from_buffer(buf)
-    dets= roi.get_objects_typed(hailo.HAILO_DETECTION)
-    seen=set()
-    for i,d in enumerate(dets):
-        if d.get_label()!="person" or d.get_confidence()<CONF_THR: continue
-        pid=f"person_{i}"; seen.add(pid)
-        trailmap=ud.person_trails.setdefault(pid,{})
-        lms=d.get_objects_typed(hailo.HAILO_LANDMARKS)
-        if not lms: continue
-        pts=lms[0].get_points()
-        for idx,label in ((9,"left_wrist"),(10,"right_wrist")):
-            if idx>=len(pts): continue
-            seq=trailmap.setdefault(label,[])
-            seq.append((pts[idx].x(),pts[idx].y()))
-            if len(seq)>TRAIL_LEN: seq.pop(0)
-    # prune vanished people
-    for pid in list(ud.person_trails):
-        if pid not in seen: del ud.person_trails[pid]
-    ud.set_detections(dets)
+    pose= decode_detections(roi.get_objects_typed(hailo.HAILO_DETECTION),CONF_THR,t,need)
+    pose= ud.tracker.update(pose)     # stable ids, smoothed keypoints and motion features for trails, visuals and voices
+    trails=ud.person_trails        # producer-private; consumers get a frozen copy
+    _,left=ud.tracks.update(pose)
+    for tid in left: trails.drop(f"person_{tid}")   # forget vanished people
+    for tid,kps,ok in zip(pose.ids.tolist(),pose.keypoints,pose.valid):
+        pid=f"person_{tid}"; trails.track(pid)
+        if ok: trails.push(pid,kps,WRISTS)
+    if v is not None: v.feed(pose) # queued before publish, so the tick that sees the snapshot applies it
+    ud.publish(pose)
     return Gst.PadProbeReturn.OK
 
 # ────────── audio sync ──────────
-def sync_audio(dets,snd,people):
-    global cur_sound,audio_pipelines
+def sync_audio(pose,snd,people):
+    global cur_sound,modulator
     if snd!=cur_sound:
-        for pl,*_ in audio_pipelines.values(): pl.set_state(Gst.State.NULL)
-        audio_pipelines.clear(); cur_sound=snd
-    for pid in list(audio_pipelines):
-        if pid not in people:
-            audio_pipelines[pid][0].set_state(Gst.State.NULL); del audio_pipelines[pid]
-    for pid in people:
-        if pid in audio_pipelines: continue
-        cx=0.5
-        for i,d in enumerate(dets):
-            if f"person_{i}"==pid:
-                b=d.get_bbox(); cx=(b.xmin()+b.xmax())/2; break
-        pl,*rest=make_audio(snd,pid,cx)
-        audio_pipelines[pid]=(pl,*rest)
+        voices.set_sound(snd,loudness.gain(snd) if snd else 1.0); cur_sound=snd
+        modulator=Modulator(mod_matrix.get(visual_names[cur_vis],mod_matrix["default"]))
+    for pid in list(voices.active):
+        if pid not in people: voices.release(pid)
+    if not snd: return
+    modulator.update(pose)
+    for tid,p in modulator.params().items():
+        pid=f"person_{tid}"
+        if pid not in people: continue
+        if pid in voices.active: voices.set_params(pid,**p)
+        else: voices.acquire(pid,**p)
 
 # ────────── main loop ──────────
 def loop(ud):
-    global cur_vis,mode,is_fullscreen,SCREEN_W,SCREEN_H,HALF_W,welcome_played,welcome_pipeline,tutorial_sound_on
-    show_kp=True; running=True
+    global screen,cur_vis,mode,is_fullscreen,SCREEN_W,SCREEN_H,HALF_W,welcome_played,welcome_pipeline,tutorial_sound_on
+    show_kp=True; show_stats=False; running=True
+    poses=PoseClock(Visual.pose_mode,Visual.horizon); render_rate=RateMeter(); latency=Ema(); draw_lag=Ema(); audio_key=None
+    last_layout=None; last_seq=last_fseq=-1; had_people=False
+    stats_txt=""; stats_t=0.0; hud=Hud(texts,TXT,HUD_SIZE); fed=None
     while running:
         for e in pygame.event.get():
             if e.type==pygame.QUIT or (e.type==pygame.KEYDOWN and e.key==pygame.K_q): running=False
@@ -171,12 +192,14 @@ def loop(ud):
                     case pygame.K_UP   if visuals: cur_vis=(cur_vis+1)%len(visuals)
                     case pygame.K_DOWN if visuals: cur_vis=(cur_vis-1)%len(visuals)
                     case pygame.K_k: show_kp=not show_kp
+                    case pygame.K_f: show_stats=not show_stats
                     case pygame.K_p:
                         is_fullscreen=not is_fullscreen
                         screen_mode=pygame.FULLSCREEN if is_fullscreen else 0
                         size=(0,0) if is_fullscreen else (1280,720)
-                        screen.__setattr__('screen', pygame.display.set_mode(size,screen_mode))
+                        screen=pygame.display.set_mode(size,screen_mode)
                         SCREEN_W,SCREEN_H=screen.get_size(); HALF_W=SCREEN_W//2
+                        camera.reset()
                     case pygame.K_t:
                         if cur_vis==0:
                             tutorial_sound_on=not tutorial_sound_on
@@ -185,8 +208,20 @@ def loop(ud):
                         else:
                             cur_vis=0; tutorial_sound_on=True; welcome_played=False
                             if welcome_pipeline: welcome_pipeline.set_state(Gst.State.NULL); welcome_pipeline=None
+        # swap in edited visuals between frames; inference keeps running
+        for p in (watcher.changes() if watcher else ()):
+            if visuals.reload(p) is not None:
+                visual_names[:]=visuals.names; last_layout=None; print("[visuals] reloaded",os.path.basename(p))
+        # the data thread feeds the current visual and decodes only what is read
+        vis=visuals.get(cur_vis); need=needed_keypoints(mode==2 and show_kp)
+        if (vis,need)!=fed: ud.consumer=(vis if isinstance(vis,Visual) else None,need); fed=(vis,need)
+        if isinstance(vis,Visual):
+            try: vis.sync()            # the poses the data thread queued, before anything reads the visual
+            except Exception as err: print("[visuals]",type(vis).__name__,err); ud.consumer=(None,need)
+        # one consistent snapshot per tick
+        snap=ud.snapshots.get()
         # decide snd
-        person_ids=list(ud.person_trails.keys())
+        person_ids=list(snap.trails)
         if mode in (0,1):
             if cur_vis==0 and tutorial_sound_on and person_ids and not welcome_played and not welcome_pipeline:
                 wp=os.path.join(os.getcwd(),"welcome.wav")
@@ -195,65 +230,80 @@ def loop(ud):
             else:
                 snd=sound_path(cur_vis); play=person_ids if snd else []
         else: snd=None; play=[]
-        sync_audio(ud.detections,snd,play)
+        if (snap.seq,snd)!=audio_key:  # nothing to reconcile otherwise
+            sync_audio(snap.pose,snd,play); audio_key=(snap.seq,snd)
+
+        # dirty tracking – a panel is redrawn only when one of its inputs changed
+        now=time.monotonic(); poses.push(snap.pose,now)
+        shown=now+(draw_lag.value or 0)  # when this tick reaches the screen – poses are predicted to it
+        if show_stats and now-stats_t>0.5:
+            stats_t=now
+            stats_txt=(f"infer {ud.infer_rate.fps:4.1f} fps  render {render_rate.fps:4.1f} fps  "
+                       f"latency {(latency.value or 0)*1000:3.0f} ms")
+        items=((visual_names[cur_vis],20,20),("Visual-Only",SCREEN_W-180,20)) if mode==0 else \
+              ((visual_names[cur_vis],20,20),("Split",SCREEN_W-100,20)) if mode==1 else \
+              ((f"Keypoints {'On' if show_kp else 'Off'}",SCREEN_W-250,20),)
+        if show_stats: items+=((stats_txt,20,SCREEN_H-40),)
+        layout=(mode,cur_vis,show_kp,SCREEN_W,SCREEN_H)
+        full=hud.set(items) or layout!=last_layout
+        people=len(snap.pose)>0 or bool(snap.trails)
+        new_pose=snap.seq!=last_seq and (people or had_people)   # empty → empty is no change
+        moving=poses.moving(shown)
+        vis_moving=vis.moving(shown) if isinstance(vis,Visual) else moving   # the clock the visual draws with
+        vis_rect=(0,0,SCREEN_W,SCREEN_H) if mode==0 else (0,0,HALF_W,SCREEN_H) if mode==1 else None
+        cam_rect=(HALF_W,0,HALF_W,SCREEN_H) if mode==1 else (0,0,SCREEN_W,SCREEN_H) if mode==2 else None
+        dirty=[]
+        if vis_rect and (full or new_pose or vis_moving or animating(vis)): dirty.append(vis_rect)
+        if cam_rect and (full or new_pose or moving or ud.frames.seq!=last_fseq): dirty.append(cam_rect)
+        last_layout,last_seq,had_people=layout,snap.seq,people
 
-        # draw
-        if mode==0:
-            screen.fill(BG); visuals[cur_vis].visualize(ud,screen)
-            txt(visual_names[cur_vis]); txt("Visual-Only",SCREEN_W-180)
-        elif mode==1:
-            split_screen(ud)
-            txt(visual_names[cur_vis]); txt("Split",SCREEN_W-100)
-        else:
-            screen.fill(BG)
-            if ud.frame is not None:
-                frm=cv2.flip(cv2.resize(ud.frame,(SCREEN_W,SCREEN_H)),1)
-                screen.blit(pygame.surfarray.make_surface(np.rot90(frm)),(0,0))
-                for d in ud.detections:
-                    if d.get_label()!="person" or d.get_confidence()<CONF_THR: continue
-                    b=d.get_bbox()
-                    x1,y1 = int(b.xmin()*SCREEN_W),int(b.ymin()*SCREEN_H)
-                    x2,y2 = int(b.xmax()*SCREEN_W),int(b.ymax()*SCREEN_H)
-                    pygame.draw.rect(screen,BBOX_CLR,(x1,y1,x2-x1,y2-y1),2)
-                    if show_kp:
-                        lms=d.get_objects_typed(hailo.HAILO_LANDMARKS)
-                        if lms:
-                            for p in lms[0].get_points():
-                                pygame.draw.circle(screen,(255,0,0),(int(p.x()*SCREEN_W),int(p.y()*SCREEN_H)),3)
-            txt(f"Keypoints {'On' if show_kp else 'Off'}",SCREEN_W-250)
-        pygame.display.flip(); clock.tick(30)
+        if dirty:
+            # pose resampled to this tick, camera frame fetched once
+            last_fseq,frame=ud.frames.latest() if cam_rect else (ud.frames.seq,None)   # seq of the frame drawn, not a later one
+            view=RenderView(poses.sample(shown),snap.trails,frame,snap.pose)
+            if full: screen.fill(BG)
+            if vis_rect in dirty: draw_visual(view,vis_rect,shown)
+            if cam_rect in dirty: draw_camera(view,cam_rect,show_kp and mode==2)
+            rects=[pygame.Rect(r) for r in dirty]
+            hud.draw(screen,rects)         # clipped to what was just repainted
+            if full: pygame.display.flip()
+            else: pygame.display.update(rects)
+            t=time.monotonic(); render_rate.tick(t); draw_lag.add(t-now)
+            if len(snap.pose): latency.add(t-snap.pose.t)   # capture → photon of the newest pose
+        clock.tick(RENDER_HZ)
 
     if welcome_pipeline: welcome_pipeline.set_state(Gst.State.NULL)
-    for pl,*_ in audio_pipelines.values(): pl.set_state(Gst.State.NULL)
+    voices.shutdown()
     pygame.quit(); os._exit(0)
 
 # ────────── userdata ──────────
 class UD(app_callback_class):
     def __init__(self):
-        super().__init__(); self.frame=None; self.detections=[]; self.person_trails={}
-    def set_frame(self,f): self.frame=f
-    def set_detections(self,d): self.detections=d
+        super().__init__(); self.frames=FrameSlot(); self.person_trails=TrailMap(TRAIL_LEN)
+        self.snapshots=SnapshotBox(); self.infer_rate=RateMeter()
+        self.tracker=Tracker(smoother=OneEuro(SMOOTH_MIN_CUTOFF,SMOOTH_BETA),predictor=ConstantVelocity(),kinematics=Kinematics())
+        self.tracks=TrackRegistry(ttl=0.0)    # the tracker already coasts through dropouts
+        self.consumer=(None,None)  # set by the render loop as one tuple: (Visual to feed, keypoints to decode)
+    def set_frame(self,f): self.frames.write(f)
+    def publish(self,pose): self.snapshots.publish(pose,self.person_trails.freeze())
 
 # ────────── visuals ──────────
 def load_visuals():
-    d="multi_person_visuals"
-    if not os.path.isdir(d): return
-    for f in os.listdir(d):
-        if not f.endswith(".py"): continue
-        modname=f[:-3]
-        spec=importlib.util.spec_from_file_location(modname,os.path.join(d,f))
-        m=importlib.util.module_from_spec(spec); spec.loader.exec_module(m)
-        if hasattr(m,"VisualClass"):
-            visuals.append(m.VisualClass())
-            visual_names.append(modname.replace("Visual",""))
+    """Registry from the cached manifest; plugins are imported on first use or by warm()."""
+    global visuals,visual_names
+    Visual.pose_mode,Visual.horizon=POSE_MODE,PREDICT_HORIZON   # one setting for every plugin's clock
+    visuals=VisualRegistry("multi_person_visuals")
+    visuals.add_builtin("Motion Trails",MotionTrails,order=0,required_keypoints=WRISTS)
+    visual_names=visuals.names
 
 class MotionTrails:
     def visualize(self,ud,surf): draw_trails(surf,ud.person_trails)
 
 # ────────── main ──────────
 if __name__=="__main__":
-    visuals.append(MotionTrails()); visual_names.append("Motion Trails")
     load_visuals()
+    visuals.warm(warm_sound)
+    watcher=PluginWatcher("multi_person_visuals"); watcher.start()
     ud=UD()
     app=GStreamerPoseEstimationApp(gst_cb,ud)
     threading.Thread(target=app.run,daemon=True).start()
@@ -19,6 +19,8 @@ from hailo_apps_infra.hailo_rpi_common import (
     app_callback_class,
 )
 from hailo_apps_infra.pose_estimation_pipeline import GStreamerPoseEstimationApp
+from text_cache import TextCache
+from loudness import LoudnessIndex
 
 # ── Init ───────────────────────────────────────────────────────────
 Gst.init(None)
@@ -31,7 +33,7 @@ HALF_SCREEN_WIDTH            = SCREEN_WIDTH // 2
 pygame.display.set_caption("Enhanced Pose Estimation with Audio")
 
 clock          = pygame.time.Clock()
-font           = pygame.font.Font(None, 36)
+texts          = TextCache()   # HUD strings are rasterised once, not every frame
 is_fullscreen  = True
 
 # ── Colours ────────────────────────────────────────────────────────
@@ -55,15 +57,8 @@ trail_length   = 30
 person_trails  = {}             # {person_id: {kp_name: [points]}}
 audio_pipelines = {}            # {key: (pipeline, pitch, eq, vol, pan)}
 
-# pre-measured integrated loudness (LUFS)
-lufs_values = {
-    "AccelerationGlowVisual.wav": -24.18,
-    "ElbowTrailsVisual.wav":      -26.72,
-    "FeetHeatmapVisual.wav":      -43.33,
-    "HipCirclesVisual.wav":       -17.93,
-    "SkeletonVisual.wav":         -12.23,
-    "SpineLineVisual.wav":        -20.67,
-}
+# integrated loudness (LUFS), measured once per file and cached in sounds/.loudness.json
+loudness = LoudnessIndex()
 
 # ───────────────────────────────────────────────────────────────────
 #  Helper: resolve visual index → existing WAV absolute path
@@ -107,11 +102,8 @@ def create_audio_pipeline(sound_file: str,
     volume.link(sink)
 
     # normalise loudness → –23 LUFS
-    base = os.path.basename(sound_file)
-    lufs = lufs_values.get(base, -23.0)
-    target = -23.0
-    volume.set_property("volume",
-                        10 ** ((target - lufs) / 20) if lufs < target else 1.0)
+    volume.set_property("volume", loudness.gain(sound_file))
+    loudness.save()                # no-op unless the file was just measured
 
     # spatial pan (–1 = left, +1 = right)
     if person_position is not None:
@@ -161,11 +153,11 @@ def draw_motion_trails(surface):
 
 def display_visual_name(name, default=False):
     if default: name += " – Single Person"
-    txt = font.render(name, True, TEXT_COLOR)
+    txt = texts.render(name, TEXT_COLOR)
     screen.blit(txt, (20, 20))
 
 def display_mode_text(txt):
-    surf = font.render(txt, True, TEXT_COLOR)
+    surf = texts.render(txt, TEXT_COLOR)
     screen.blit(surf, (SCREEN_WIDTH - surf.get_width() - 20, 20))
 
 # ───────────────────── vision helpers ─────────────────────────────
@@ -0,0 +1,215 @@
+# audio_engine.py – in-process NumPy block mixer for the per-person voices, one GStreamer sink
+
+import gi
+gi.require_version("Gst", "1.0")
+from gi.repository import Gst
+import numpy as np
+from pcm_cache import Pcm, PcmCache, samples
+try:
+    from scipy.signal import sosfilt
+except ImportError:                # EQ is bypassed without scipy
+    sosfilt = None
+
+RATE     = 48000
+BLOCK    = 480                     # frames per mix block (10 ms)
+EQ_BANDS = 10
+EQ_FREQS = (29, 59, 119, 237, 474, 947, 1889, 3770, 7523, 15011)   # equalizer-10bands centres
+EQ_Q     = 1.41                    # ~one octave per band
+OUT_CAPS = f"audio/x-raw,format=F32LE,layout=interleaved,rate={RATE},channels=2"
+
+def to_float(pcm:Pcm, rate:int=RATE)->np.ndarray:
+    """(n, 2) float32 at rate – decoded once per sound, linear-interpolated."""
+    x = samples(pcm)
+    if pcm.channels == 1: x = np.repeat(x, 2, 1)
+    elif pcm.channels > 2: x = x[:, :2]
+    if pcm.rate != rate:
+        n = int(len(x) * rate / pcm.rate)
+        t = np.arange(n) * (pcm.rate / rate)
+        src = np.arange(len(x))
+        x = np.stack([np.interp(t, src, x[:, c]) for c in range(2)], 1).astype(np.float32)
+    return np.ascontiguousarray(x)
+
+def peaking_sos(gains, rate:int=RATE)->np.ndarray|None:
+    """(k, 6) RBJ peaking sections for the non-zero dB gains, None if flat."""
+    rows = []
+    for f0, g in zip(EQ_FREQS, gains):
+        if not g or f0 >= rate / 2: continue
+        a  = 10 ** (g / 40)
+        w  = 2 * np.pi * f0 / rate
+        al = np.sin(w) / (2 * EQ_Q)
+        b  = (1 + al * a, -2 * np.cos(w), 1 - al * a)
+        d  = (1 + al / a, -2 * np.cos(w), 1 - al / a)
+        rows.append([*(v / d[0] for v in b), 1.0, d[1] / d[0], d[2] / d[0]])
+    return np.array(rows) if rows else None
+
+class Voice:
+    """Playback state of one person: read position, varispeed step, gains, EQ.
+
+    No audio objects – the pool renders every busy voice in one pass per
+    block.  Gains and the resampling step are ramped linearly across each
+    block from the last applied value, so starts, stops and parameter moves
+    never click or zipper.
+    """
+    def __init__(self, name:str):
+        self.name   = name
+        self.pid    = None
+        self.pos    = 0.0          # fractional frame in the shared sound
+        self.step   = 1.0          # pitch ratio = resampling step
+        self.glide  = 1.0          # step reached at the end of the last block
+        self.pan    = 0.0
+        self.volume = 1.0
+        self.gain   = np.zeros(2, np.float32)    # applied at the end of the last block
+        self.eq     = ()
+        self.sos    = None
+        self.zi     = None
+
+    @property
+    def busy(self)->bool:
+        """Playing, or still fading out after park()."""
+        return self.pid is not None or bool(self.gain.any())
+
+    def target(self)->np.ndarray:
+        if self.pid is None: return np.zeros(2, np.float32)
+        th = (self.pan + 1) * np.pi / 4              # equal power, unity in the centre
+        return np.float32(self.volume * np.sqrt(2)) * np.array((np.cos(th), np.sin(th)), np.float32)
+
+    def set_params(self, pan=None, pitch=None, volume=None, eq=None):
+        """pan −1…1, pitch ratio, linear volume, eq = up to 10 band gains in dB."""
+        if pan is not None:    self.pan = max(-1.0, min(1.0, pan))
+        if pitch is not None:  self.step = max(0.25, min(4.0, pitch))
+        if volume is not None: self.volume = volume
+        if eq is not None:
+            eq = tuple(float(g) for g in list(eq)[:EQ_BANDS])
+            if eq != self.eq:
+                self.eq, sos = eq, peaking_sos(eq)
+                if sos is None or self.zi is None or len(self.zi) != len(sos):
+                    self.zi = None if sos is None else np.zeros((len(sos), 2, 2))
+                self.sos = sos
+
+    def start(self, pid, pan=0.0, pitch=1.0, volume=1.0, eq=()):
+        # every parameter is reset so nothing leaks from the previous person
+        self.pos, self.eq, self.sos, self.zi = 0.0, (), None, None
+        self.set_params(pan=pan, pitch=pitch, volume=volume, eq=eq)
+        self.glide = self.step
+        self.pid = pid
+
+    def park(self):
+        self.pid = None            # gain ramps to 0 over the next block
+
+class VoicePool:
+    """Fixed set of Voices mixed block by block into one appsrc → sink.
+
+    Every voice plays the same sound (the current visual's), so a block is
+    a handful of array ops over a (voices, BLOCK) index grid: fractional
+    positions, one gather with linear interpolation for pitch, optional
+    sosfilt EQ per voice with state carried across blocks, and a gain ramp
+    summed into the stereo output.  prepare() converts a WAV to float at
+    RATE once per file version (the warm-up thread calls it ahead of time,
+    so set_sound() on a visual switch is a lookup); acquire()/release()
+    hand voices to people; people beyond the pool size stay silent.
+    """
+    def __init__(self, size:int=6):
+        self.voices = [Voice(f"voice{i}") for i in range(size)]
+        self.pcms   = PcmCache()
+        self.sound  = None
+        self.active = {}           # pid → Voice
+        self._data  = None         # (n, 2) float32 of the current sound
+        self._level = np.float32(1.0)   # its loudness-normalising gain
+        self._floats = {}          # path → (Pcm it came from, (n, 2) float32 at RATE)
+        self._ramp  = np.arange(BLOCK, dtype=np.float64)
+        self._ramp2 = self._ramp ** 2 / (2 * BLOCK)
+        self._fade  = (np.arange(1, BLOCK + 1, dtype=np.float32) / BLOCK)[:, None]
+        self._out   = np.zeros((BLOCK, 2), np.float32)
+        self._frames = 0
+        self.pipeline = Gst.parse_launch(
+            f"appsrc name=src format=time caps={OUT_CAPS} max-bytes={2 * BLOCK * 8} "
+            "! audioconvert ! autoaudiosink")
+        self.src    = self.pipeline.get_by_name("src")
+        self.src.connect("need-data", self._need_data)
+        bus = self.pipeline.get_bus(); bus.add_signal_watch(); bus.connect("message", self._on_message)
+        self.pipeline.set_state(Gst.State.PLAYING)
+
+    def _on_message(self, _, msg):
+        if msg.type == Gst.MessageType.ERROR:
+            print("[audio]", msg.src.get_name(), msg.parse_error()[1])
+
+    def render(self)->np.ndarray:
+        """Mix the next BLOCK frames of every busy voice; reused (BLOCK, 2) array."""
+        out, data = self._out, self._data
+        out.fill(0)
+        vs = [v for v in self.voices if v.busy]
+        if data is None or not vs: return out
+        n = len(data)
+        pos  = np.array([v.pos for v in vs])
+        s0   = np.array([v.glide for v in vs]); s1 = np.array([v.step for v in vs])
+        # position = integral of a step ramping s0 → s1 over the block
+        idx  = pos[:, None] + s0[:, None] * self._ramp + (s1 - s0)[:, None] * self._ramp2   # (V, BLOCK)
+        i0   = np.floor(idx)
+        f    = (idx - i0).astype(np.float32)[..., None]
+        i0   = i0.astype(np.int64) % n
+        x    = data[i0]
+        x   += (data[(i0 + 1) % n] - x) * f                     # (V, BLOCK, 2)
+        g0 = np.array([v.gain for v in vs]); g1 = np.array([v.target() for v in vs])
+        gain = g0[:, None] + (g1 - g0)[:, None] * self._fade   # (V, BLOCK, 2)
+        for k, v in enumerate(vs):
+            if v.sos is not None and sosfilt is not None:
+                x[k], v.zi = sosfilt(v.sos, x[k], axis=0, zi=v.zi)
+            v.pos   = (v.pos + (s0[k] + s1[k]) * BLOCK / 2) % n
+            v.glide = s1[k]
+            v.gain  = g1[k]
+        np.einsum("vnc,vnc->nc", x, gain, out=out)
+        out *= self._level
+        np.clip(out, -1.0, 1.0, out=out)
+        return out
+
+    def _need_data(self, src, _length):
+        buf = Gst.Buffer.new_wrapped(self.render().tobytes())
+        buf.pts      = self._frames * Gst.SECOND // RATE
+        buf.duration = BLOCK * Gst.SECOND // RATE
+        self._frames += BLOCK
+        src.emit("push-buffer", buf)
+
+    def prepare(self, path:str)->np.ndarray:
+        """(n, 2) float32 of path at RATE, converted once per file version; any thread."""
+        pcm = self.pcms.get(path)
+        hit = self._floats.get(path)
+        if hit is not None and hit[0] is pcm: return hit[1]
+        data = to_float(pcm)
+        self._floats[path] = (pcm, data)
+        return data
+
+    def set_sound(self, path:str|None, gain:float=1.0):
+        """Switch every voice to path, scaled by gain (loudness normalisation)."""
+        self.release_all()
+        self.sound = path
+        for v in self.voices: v.gain[:] = 0      # cut rather than fade into another sound
+        self._level = np.float32(gain)
+        try:
+            self._data = self.prepare(path) if path else None
+        except (OSError, ValueError) as err:    # undecodable sound → silence, not a dead render loop
+            print("[audio] cannot play", path, err)
+            self._data = None
+
+    def acquire(self, pid, **params)->Voice|None:
+        v = self.active.get(pid)
+        if v is not None or not self.sound: return v
+        v = next((v for v in self.voices if not v.busy), None)
+        if v is None: return None
+        v.start(pid, **params)
+        self.active[pid] = v
+        return v
+
+    def release(self, pid):
+        v = self.active.pop(pid, None)
+        if v is not None: v.park()
+
+    def release_all(self):
+        for pid in list(self.active): self.release(pid)
+
+    def set_params(self, pid, **params):
+        v = self.active.get(pid)
+        if v is not None: v.set_params(**params)
+
+    def shutdown(self):
+        self.release_all()
+        self.pipeline.set_state(Gst.State.NULL)
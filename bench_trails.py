@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# bench_trails.py – draw calls and ms/frame for trail drawing, per-segment vs PolylineRenderer
+#
+#   python3 bench_trails.py [frames]        (runs headless, no Hailo needed)
+
+import os, sys, time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np, pygame
+from trail_buffer import TrailBuffer
+from polyline import PolylineRenderer
+
+W, H       = 960, 1080             # one half of a 1080p split screen
+TRAIL_LEN  = 30
+TRAILS_PER = 2                     # left/right wrist (or elbow) per person
+
+def make_trails(people, rng):
+    trails = []
+    for _ in range(people * TRAILS_PER):
+        t = TrailBuffer(TRAIL_LEN)
+        t.extend(np.cumsum(rng.normal(0, 0.01, (TRAIL_LEN, 2)), 0) + rng.uniform(0.2, 0.8, 2))
+        trails.append((t, tuple(rng.integers(100, 256, 3).tolist())))
+    return trails
+
+def per_segment(surf, trails):
+    calls = 0
+    for t, col in trails:
+        pts = [(int(x * W), int(y * H)) for x, y in t.view().tolist()]
+        for i in range(1, len(pts)):
+            pygame.draw.line(surf, col, pts[i - 1], pts[i], 5); calls += 1
+    return calls
+
+def batched(renderer, fade):
+    def run(surf, trails):
+        return renderer.draw(surf, [(t.to_screen(W, H), col) for t, col in trails], 5, fade)
+    return run
+
+def bench(fn, surf, trails, frames):
+    calls = fn(surf, trails)       # warm-up (also fills the fade colour cache)
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        surf.fill((0, 0, 0)); fn(surf, trails)
+    return calls, (time.perf_counter() - t0) * 1000 / frames
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.init()
+    surf = pygame.display.set_mode((W, H))
+    rng  = np.random.default_rng(0)
+    renderer = PolylineRenderer()
+    cases = (("per-segment draw.line", per_segment),
+             ("PolylineRenderer",      batched(renderer, 0)),
+             ("PolylineRenderer fade=3", batched(renderer, 3)))
+    print(f"{'people':>6}  {'method':<24} {'calls':>6} {'ms/frame':>9}")
+    for people in (1, 4, 8):
+        trails = make_trails(people, rng)
+        for name, fn in cases:
+            calls, ms = bench(fn, surf, trails, frames)
+            print(f"{people:>6}  {name:<24} {calls:>6} {ms:>9.3f}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# camera_panel.py – fused resize+flip+rotate blit of the camera frame into a cached Surface
+
+import sys, cv2, numpy as np, pygame
+
+class CameraPanel:
+    """Persistent Surface + scratch buffer per target size.
+
+    The old path was resize → flip → rot90 → make_surface, i.e. four
+    temporaries and a new Surface per frame.  flip(…,1) followed by rot90
+    is just a transpose into pygame's (x, y) layout, and a 32-bit Surface
+    already stores its pixels row-major, so the frame is resized into a
+    reused buffer and colour-swizzled straight into the Surface's pixel
+    memory.  Nothing is allocated per frame apart from the pixel view.
+    """
+    def __init__(self):
+        self._panels = {}          # (w, h) → (surface, scratch, cvt code | None)
+
+    def reset(self):
+        """Drop every cached size (call after the display mode changes)."""
+        self._panels.clear()
+
+    @staticmethod
+    def _cvt_code(surf):
+        # byte order of a 32-bit pixel in memory decides the swizzle
+        if sys.byteorder != "little" or surf.get_bytesize() != 4: return None
+        if surf.get_pitch() != surf.get_width() * 4: return None
+        return {(16, 8, 0): cv2.COLOR_RGB2BGRA,
+                (0, 8, 16): cv2.COLOR_RGB2RGBA}.get(surf.get_shifts()[:3])
+
+    def _panel(self, size):
+        p = self._panels.get(size)
+        if p is None:
+            surf = pygame.Surface(size)
+            if pygame.display.get_surface(): surf = surf.convert()
+            w, h = size
+            p = self._panels[size] = (surf, np.empty((h, w, 3), np.uint8), self._cvt_code(surf))
+        return p
+
+    def render(self, frame:np.ndarray, size:tuple[int,int])->pygame.Surface:
+        """Return the cached Surface of `size` holding the scaled frame."""
+        surf, buf, code = self._panel(size)
+        w, h = size
+        cv2.resize(frame, size, dst=buf)
+        px = pygame.surfarray.pixels2d(surf) if code is not None else pygame.surfarray.pixels3d(surf)
+        if code is not None:
+            cv2.cvtColor(buf, code, dst=px.T.view(np.uint8).reshape(h, w, 4))
+        else:
+            px[...] = buf.transpose(1, 0, 2)
+        del px                     # unlock before the Surface is blitted
+        return surf
@@ -0,0 +1,43 @@
+# frame_slot.py – preallocated triple-buffered frame handoff (gst thread → render loop)
+
+import threading
+import numpy as np
+
+class FrameSlot:
+    """Ring of preallocated frames filled in place by the producer.
+
+    The GStreamer callback calls write() for every buffer; the render loop
+    calls latest() once per tick.  Three buffers are enough for the writer to
+    never touch the frame being read nor the newest published one, so the
+    only shared state is a couple of indices swapped under a tiny lock –
+    the pixel copy itself happens outside it.
+    """
+    def __init__(self, depth:int=3):
+        if depth < 3: raise ValueError("FrameSlot needs at least 3 buffers")
+        self._depth  = depth
+        self._bufs   = []
+        self._lock   = threading.Lock()
+        self._ready  = -1          # newest published buffer
+        self._read   = -1          # buffer held by the consumer
+        self.seq     = 0           # bumps on every publish
+
+    def _alloc(self, shape, dtype):
+        self._bufs  = [np.empty(shape, dtype) for _ in range(self._depth)]
+        self._ready = self._read = -1
+
+    def write(self, src:np.ndarray):
+        """Copy src into a free buffer and publish it."""
+        if not self._bufs or self._bufs[0].shape != src.shape or self._bufs[0].dtype != src.dtype:
+            with self._lock: self._alloc(src.shape, src.dtype)
+        with self._lock:
+            idx = next(i for i in range(self._depth) if i not in (self._ready, self._read))
+        np.copyto(self._bufs[idx], src)
+        with self._lock:
+            self._ready = idx; self.seq += 1
+
+    def latest(self)->tuple[int, np.ndarray|None]:
+        """(seq, newest frame) read together; the frame stays untouched until the next latest() call."""
+        with self._lock:
+            if self._ready < 0: return self.seq, None
+            self._read = self._ready
+            return self.seq, self._bufs[self._read]
@@ -0,0 +1,68 @@
+# heatmap.py – decaying low-res density grid, colour-mapped through a cached LUT
+
+import numpy as np, pygame
+
+# (position 0-1, RGB) stops of the default black → red → yellow → white ramp
+HEAT_STOPS = ((0.0, (0, 0, 0)), (0.35, (120, 0, 40)), (0.6, (230, 60, 0)),
+              (0.85, (255, 210, 0)), (1.0, (255, 255, 255)))
+
+def build_lut(stops=HEAT_STOPS)->np.ndarray:
+    """(256, 3) uint8 colour ramp interpolated between stops."""
+    pos = np.array([p for p, _ in stops])
+    rgb = np.array([c for _, c in stops], np.float32)
+    x = np.linspace(0, 1, 256)
+    return np.stack([np.interp(x, pos, rgb[:, c]) for c in range(3)], 1).astype(np.uint8)
+
+class HeatmapGrid:
+    """Accumulation buffer: O(new points + grid cells) per frame, constant memory.
+
+    Every frame the grid is multiplied by 0.5**(dt/half_life), new points
+    are splatted with a small Gaussian kernel, and the result is mapped
+    through a 256-entry LUT into a grid-sized Surface that is smooth-scaled
+    into a cached Surface of the target size.
+    """
+    def __init__(self, size:tuple[int,int]=(160, 90), half_life:float=3.0,
+                 radius:int=2, saturation:float=4.0, stops=HEAT_STOPS):
+        self.gw, self.gh  = size
+        self.half_life    = half_life
+        self.saturation   = saturation
+        self.grid         = np.zeros((self.gh, self.gw), np.float32)
+        off = np.arange(-radius, radius + 1)
+        self._dy, self._dx = (a.ravel() for a in np.meshgrid(off, off, indexing="ij"))
+        self._kernel = np.exp(-(self._dx ** 2 + self._dy ** 2) / (0.5 * radius ** 2 + 1e-6)).astype(np.float32)
+        self._lut    = build_lut(stops)
+        self._level  = np.empty((self.gh, self.gw), np.float32)
+        self._small  = pygame.Surface(size)
+        self._scaled = {}          # target size → Surface
+
+    def visible(self)->bool:
+        """Does any cell still map above the bottom LUT entry?"""
+        return bool(self.grid.max() > self.saturation / 255)
+
+    def decay(self, dt:float):
+        if dt > 0: self.grid *= 0.5 ** (dt / self.half_life)
+
+    def splat(self, pts, weight:float=1.0):
+        """Add (n, 2) normalised points; NaN rows are ignored."""
+        pts = np.asarray(pts, np.float32).reshape(-1, 2)
+        pts = pts[~np.isnan(pts).any(1)]
+        if not len(pts): return
+        cx = (pts[:, 0] * self.gw).astype(int)[:, None] + self._dx
+        cy = (pts[:, 1] * self.gh).astype(int)[:, None] + self._dy
+        inside = (cx >= 0) & (cx < self.gw) & (cy >= 0) & (cy < self.gh)
+        w = np.broadcast_to(self._kernel * weight, cx.shape)
+        np.add.at(self.grid, (cy[inside], cx[inside]), w[inside])
+
+    def render(self, size:tuple[int,int])->pygame.Surface:
+        """Colour-mapped grid scaled to size (reused Surface)."""
+        # 1 - exp(-d/s) saturates smoothly instead of clipping hot spots
+        np.multiply(self.grid, -1.0 / self.saturation, out=self._level)
+        np.exp(self._level, out=self._level)
+        idx = ((1.0 - self._level) * 255).astype(np.uint8)
+        pygame.surfarray.blit_array(self._small, self._lut[idx.T])
+        dst = self._scaled.get(size)
+        if dst is None:
+            self._scaled.clear()
+            dst = self._scaled[size] = pygame.Surface(size)
+        pygame.transform.smoothscale(self._small, size, dst)
+        return dst
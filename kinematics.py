@@ -0,0 +1,54 @@
+# kinematics.py – per-track velocity, acceleration, jerk and motion energy from a short pose history
+
+from typing import NamedTuple
+import numpy as np
+
+DEPTH = 4                          # samples per track – third differences need four
+
+class MotionFeatures(NamedTuple):
+    """Per-person motion of one pose frame, rows aligned with its ids.
+
+    Units are normalised screen units and seconds; keypoints without enough
+    history (or not decoded) read 0.
+    """
+    velocity: np.ndarray           # (N, 17, 2) units/s
+    accel:    np.ndarray           # (N, 17, 2) units/s²
+    jerk:     np.ndarray           # (N, 17, 2) units/s³
+    speed:    np.ndarray           # (N, 17)    |velocity|
+    energy:   np.ndarray           # (N,)       ½·mean |v|² over the keypoints present
+
+class Kinematics:
+    """Batched finite differences over each track's last DEPTH positions.
+
+    Like smoothing.OneEuro it keeps no state of its own: the caller holds
+    hist (M, DEPTH, K, 2) positions and times (M, DEPTH) capture times,
+    oldest first, per track.  Each derivative divides by the real spacing of
+    the samples it spans, so dropped or uneven frames do not skew it, and
+    one call costs a fixed number of NumPy ops for all tracks.
+    """
+    def init(self, xy:np.ndarray, t:float)->tuple[np.ndarray, np.ndarray]:
+        """History of tracks first seen at xy (M, K, 2)."""
+        hist = np.full((len(xy), DEPTH) + xy.shape[1:], np.nan, np.float32)
+        times = np.full((len(xy), DEPTH), np.nan)
+        hist[:, -1], times[:, -1] = xy, t
+        return hist, times
+
+    def push(self, hist:np.ndarray, times:np.ndarray, xy:np.ndarray,
+             t:float)->tuple[np.ndarray, np.ndarray]:
+        """Histories shifted by one with xy at t as the newest sample."""
+        hist = np.concatenate((hist[:, 1:], xy[:, None].astype(np.float32)), 1)
+        times = np.concatenate((times[:, 1:], np.full((len(times), 1), t)), 1)
+        return hist, times
+
+    def __call__(self, hist:np.ndarray, times:np.ndarray)->MotionFeatures:
+        def diff(x, tx):
+            dt = np.maximum(np.diff(tx, axis=1), 1e-3)
+            return np.diff(x, axis=1) / dt[:, :, None, None], (tx[:, 1:] + tx[:, :-1]) / 2
+        v, tv = diff(hist, times)
+        a, ta = diff(v, tv)
+        j, _ = diff(a, ta)
+        velocity, accel, jerk = np.nan_to_num(np.stack((v[:, -1], a[:, -1], j[:, -1])), copy=False)
+        ok = ~np.isnan(v[:, -1, :, 0])
+        v2 = (velocity ** 2).sum(2)
+        energy = 0.5 * v2.sum(1) / np.maximum(ok.sum(1), 1)
+        return MotionFeatures(velocity, accel, jerk, np.sqrt(v2), energy)
@@ -0,0 +1,117 @@
+# loudness.py – ITU-R BS.1770 integrated loudness with a sidecar cache per sound directory
+
+import json, os, threading
+import numpy as np
+from pcm_cache import read_pcm, samples
+try:
+    from scipy.signal import sosfilt
+except ImportError:                # no analysis without scipy – gains stay at 1.0
+    sosfilt = None
+
+TARGET_LUFS = -23.0
+MAX_GAIN_DB = 24.0                 # don't lift near-silent files into the noise floor
+SIDECAR     = ".loudness.json"
+BLOCK_S, HOP_S = 0.4, 0.1          # 400 ms gating blocks, 75 % overlap
+ABS_GATE, REL_GATE = -70.0, -10.0
+
+def k_weighting(rate:int)->np.ndarray:
+    """(2, 6) sos: BS.1770 high-shelf pre-filter and RLB high-pass at any rate.
+
+    Bilinear-transformed analogue prototypes; at 48 kHz they reproduce the
+    coefficient tables in the recommendation.
+    """
+    k = np.tan(np.pi * 1681.974450955533 / rate); q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20); vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = [(vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0,
+             1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+    k = np.tan(np.pi * 38.13547087602444 / rate); q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    hp = [1.0, -2.0, 1.0, 1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+    return np.array([shelf, hp])
+
+def integrated_loudness(x:np.ndarray, rate:int)->float:
+    """LUFS of (n, channels) float samples; -inf if everything is gated out."""
+    z = sosfilt(k_weighting(rate), x, axis=0) ** 2
+    blk, hop = int(BLOCK_S * rate), int(HOP_S * rate)
+    if len(z) < blk: return float("-inf")
+    # mean square of every gating block from one cumulative sum
+    cs = np.vstack((np.zeros((1, z.shape[1])), np.cumsum(z, 0)))
+    starts = np.arange(0, len(z) - blk + 1, hop)
+    ms = ((cs[starts + blk] - cs[starts]) / blk).sum(1)     # channel weights are 1 for L/R/C
+    with np.errstate(divide="ignore"):
+        lk = -0.691 + 10 * np.log10(ms)
+    ms = ms[lk > ABS_GATE]
+    if not len(ms): return float("-inf")
+    rel = -0.691 + 10 * np.log10(ms.mean()) + REL_GATE
+    with np.errstate(divide="ignore"):
+        ms = ms[-0.691 + 10 * np.log10(ms) > rel]
+    return float(-0.691 + 10 * np.log10(ms.mean()))
+
+def read_float(path:str)->tuple[np.ndarray, int]:
+    """(n, channels) float32 in −1…1 and the rate of a PCM or float WAV (see pcm_cache)."""
+    pcm = read_pcm(path)
+    return samples(pcm), pcm.rate
+
+def measure(path:str)->float:
+    return integrated_loudness(*read_float(path))
+
+class LoudnessIndex:
+    """LUFS per sound file, cached in a JSON sidecar next to the sounds.
+
+    Entries are keyed by file name and stamped with mtime and size, so a
+    replaced or newly dropped WAV is measured once on the next start and
+    every other start only stats the files.  Safe to share between the
+    warm-up and render threads: the entries are only touched under a lock,
+    which is never held while a file is measured or written.
+    """
+    def __init__(self):
+        self._dirs = {}            # directory → {name: {"mtime_ns", "size", "lufs"}}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _entries(self, d:str)->dict:
+        e = self._dirs.get(d)
+        if e is None:
+            try:
+                with open(os.path.join(d, SIDECAR)) as f: e = json.load(f)
+            except (OSError, ValueError):
+                e = {}
+            self._dirs[d] = e
+        return e
+
+    def lufs(self, path:str)->float|None:
+        if sosfilt is None: return None
+        d, name = os.path.split(os.path.abspath(path))
+        st = os.stat(path)
+        with self._lock:
+            hit = self._entries(d).get(name)
+        if hit and hit["mtime_ns"] == st.st_mtime_ns and hit["size"] == st.st_size:
+            return hit["lufs"]
+        try:
+            l = measure(path)
+        except (OSError, ValueError) as err:
+            print("[loudness]", name, err); return None
+        hit = {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+               "lufs": None if np.isinf(l) else round(l, 2)}
+        with self._lock:
+            self._entries(d)[name] = hit
+            self._dirty.add(d)
+        return hit["lufs"]
+
+    def gain(self, path:str, target:float=TARGET_LUFS)->float:
+        """Linear gain that lifts path to target LUFS; boost only, like
+        normalize_sound.sh – louder files and unknown ones play at 1.0."""
+        l = self.lufs(path)
+        if l is None or l >= target: return 1.0
+        return 10 ** (min(target - l, MAX_GAIN_DB) / 20)
+
+    def save(self):
+        with self._lock:
+            out = {d: json.dumps(self._dirs[d], indent=1) for d in self._dirty}
+            self._dirty.clear()
+        for d, text in out.items():
+            try:
+                with open(os.path.join(d, SIDECAR), "w") as f: f.write(text)
+            except OSError as err:
+                print("[loudness] cannot write sidecar:", err)
@@ -0,0 +1,146 @@
+# modulation.py – declarative motion → voice-parameter matrix, evaluated for all people at once
+
+import json
+from typing import NamedTuple
+import numpy as np
+from pose_frame import PoseFrame, NUM_KP
+
+SOURCES = ("speed", "accel", "jerk", "energy", "center_x", "center_y", "count")
+TARGETS = ("pitch", "volume", "pan", "eq")
+EQ_BANDS = 10
+DEFAULT_DT = 1 / 30                # first frame / frames without capture time
+
+class Mapping(NamedTuple):
+    """source (at keypoints) → target, linear between the in/out ranges, clamped.
+
+    smooth is a one-pole time constant in seconds, rate the largest change
+    per second in output units (None = unlimited).
+    """
+    source: str
+    target: str
+    kps: tuple = ()
+    bands: tuple = ()
+    lo: float = 0.0
+    hi: float = 1.0
+    out_lo: float = 0.0
+    out_hi: float = 1.0
+    smooth: float = 0.1
+    rate: float|None = None
+
+def parse_mapping(d:dict)->Mapping:
+    src, tgt = d["source"], d["target"]
+    if src not in SOURCES: raise ValueError(f"unknown modulation source {src!r}")
+    if tgt not in TARGETS: raise ValueError(f"unknown modulation target {tgt!r}")
+    kps = d.get("keypoints", ())
+    kps = (kps,) if isinstance(kps, int) else tuple(kps)
+    if src in ("speed", "accel", "jerk") and not kps: raise ValueError(f"{src} mapping needs keypoints")
+    if any(not 0 <= k < NUM_KP for k in kps): raise ValueError(f"keypoints out of range: {kps}")
+    bands = tuple(d.get("bands", ()))
+    if tgt == "eq" and (not bands or any(not 0 <= b < EQ_BANDS for b in bands)):
+        raise ValueError(f"eq mapping needs bands in 0..{EQ_BANDS - 1}")
+    lo, hi = d.get("in", (0.0, 1.0)); out_lo, out_hi = d.get("out", (0.0, 1.0))
+    return Mapping(src, tgt, kps, bands, float(lo), float(hi), float(out_lo), float(out_hi),
+                   float(d.get("smooth", 0.1)), d.get("rate"))
+
+def load_matrix(path:str)->dict:
+    """{visual name: [Mapping]} from a JSON file; "default" covers unlisted visuals."""
+    with open(path) as f: cfg = json.load(f)
+    return {name: [parse_mapping(m) for m in maps] for name, maps in cfg.items()}
+
+class Modulator:
+    """Per-person smoothed parameter values for one visual's mappings.
+
+    update() takes each new PoseFrame, reads every source for every person
+    from its kinematics (or, for frames without, differences this and the
+    previous frame, matched by id – no jerk or energy then), maps it, and
+    advances an (N people, M mappings) state array – one set of array ops
+    regardless of the number of people or mappings.  Mappings onto the same
+    target combine multiplicatively for pitch/volume and additively for
+    pan/eq.
+    """
+    def __init__(self, mappings):
+        self.maps   = list(mappings)
+        m = len(self.maps)
+        self._kpmask = np.zeros((m, NUM_KP), bool)
+        for i, mp in enumerate(self.maps): self._kpmask[i, list(mp.kps)] = True
+        self._lo    = np.array([mp.lo for mp in self.maps])
+        self._span  = np.array([mp.hi - mp.lo or 1.0 for mp in self.maps])
+        self._olo   = np.array([mp.out_lo for mp in self.maps])
+        self._ospan = np.array([mp.out_hi - mp.out_lo for mp in self.maps])
+        self._tau   = np.array([mp.smooth for mp in self.maps])
+        self._rate  = np.array([np.inf if mp.rate is None else mp.rate for mp in self.maps])
+        self.reset()
+
+    def reset(self):
+        self._prev  = None         # previous PoseFrame
+        self._ids   = np.zeros(0, np.int64)
+        self._vel   = np.zeros((0, NUM_KP, 2))
+        self._state = np.zeros((0, len(self.maps)))
+
+    def _carry(self, ids, arr, fill):
+        """Rows of arr (one per self._ids) re-ordered to ids; unseen ids get fill."""
+        out = np.full((len(ids),) + arr.shape[1:], fill, np.float64)
+        hit = np.zeros(len(ids), bool)
+        if len(self._ids) and len(ids):
+            order = np.argsort(self._ids)
+            src = order[np.searchsorted(self._ids, ids, sorter=order).clip(0, len(order) - 1)]
+            hit = self._ids[src] == ids
+            out[hit] = arr[src[hit]]
+        return out, hit
+
+    def update(self, pose:PoseFrame)->np.ndarray:
+        """Advance with a new frame; returns the (N people, M mappings) state."""
+        if pose is self._prev: return self._state
+        n, prev = len(pose), self._prev
+        dt = pose.t - prev.t if prev is not None else 0.0
+        if dt <= 0: dt = DEFAULT_DT
+        kin = pose.kinematics
+        if kin is not None:        # shared per-track features (kinematics.py)
+            vel, speed = kin.velocity, kin.speed
+            accel, jerk = np.hypot(*kin.accel.transpose(2, 0, 1)), np.hypot(*kin.jerk.transpose(2, 0, 1))
+            energy = kin.energy
+        else:
+            # velocity / acceleration per keypoint, 0 for new people and lost points
+            xy = pose.keypoints[:, :, :2].astype(np.float64)
+            vel = np.zeros((n, NUM_KP, 2))
+            if prev is not None:
+                pxy, _ = self._carry(pose.ids, prev.keypoints[:, :, :2], np.nan)
+                vel = np.nan_to_num((xy - pxy) / dt)
+            pvel, _ = self._carry(pose.ids, self._vel, 0.0)
+            speed = np.hypot(vel[..., 0], vel[..., 1])
+            accel = np.hypot(*((vel - pvel) / dt).transpose(2, 0, 1))
+            jerk, energy = np.zeros_like(speed), np.zeros(n)
+        cx = np.nan_to_num((pose.bboxes[:, 0] + pose.bboxes[:, 2]) / 2, nan=0.5)
+        cy = np.nan_to_num((pose.bboxes[:, 1] + pose.bboxes[:, 3]) / 2, nan=0.5)
+        raw = np.empty((n, len(self.maps)))
+        for i, mp in enumerate(self.maps):
+            if   mp.source == "speed":    raw[:, i] = speed[:, self._kpmask[i]].mean(1)
+            elif mp.source == "accel":    raw[:, i] = accel[:, self._kpmask[i]].mean(1)
+            elif mp.source == "jerk":     raw[:, i] = jerk[:, self._kpmask[i]].mean(1)
+            elif mp.source == "energy":   raw[:, i] = energy
+            elif mp.source == "center_x": raw[:, i] = cx
+            elif mp.source == "center_y": raw[:, i] = cy
+            else:                         raw[:, i] = n
+        target = self._olo + self._ospan * np.clip((raw - self._lo) / self._span, 0.0, 1.0)
+        # one-pole smoothing + rate limit; new people start at their target
+        state, hit = self._carry(pose.ids, self._state, 0.0)
+        state[~hit] = target[~hit]
+        step = (target - state) * (1 - np.exp(-dt / np.maximum(self._tau, 1e-6)))
+        state += np.clip(step, -self._rate * dt, self._rate * dt)
+        self._prev, self._ids, self._vel, self._state = pose, pose.ids.copy(), vel, state
+        return state
+
+    def params(self)->dict:
+        """{track id: {pitch, volume, pan, eq}} from the current state."""
+        out = {}
+        for j, tid in enumerate(self._ids.tolist()):
+            p = {"pitch": 1.0, "volume": 1.0, "pan": 0.0}; eq = [0.0] * EQ_BANDS
+            for i, mp in enumerate(self.maps):
+                v = float(self._state[j, i])
+                if mp.target == "eq":
+                    for b in mp.bands: eq[b] += v
+                elif mp.target == "pan": p["pan"] += v
+                else: p[mp.target] *= v
+            p["eq"] = tuple(eq)
+            out[tid] = p
+        return out
@@ -1,52 +1,58 @@
-import pygame
-import hailo
+import math
 import random
+from visual_api import Visual
+from trail_buffer import TrailMap
+from sprite_atlas import SpriteAtlas
+
+ORDER = 50  # position in the visual cycle
+REQUIRED_KEYPOINTS = (9,)  # COCO indices, see KEYPOINTS
+
+class AccelerationGlowVisual(Visual):
+    required_keypoints = REQUIRED_KEYPOINTS
 
-class AccelerationGlowVisual:
     def __init__(self):
-        self.trails = {}  # {tracking_id: {'wrist': []}}
-        self.colors = {}  # {tracking_id: color}
+        super().__init__()
         self.max_trail_length = 30
-
-    def visualize(self, user_data, surface):
+        self.trails = self.tracks.own(TrailMap(self.max_trail_length))  # {tracking_id: {9: wrist}}
+        self.colors = self.tracks.own({})  # {tracking_id: color}
+        self.velocity = self.tracks.own({})  # {tracking_id: (vx, vy)} left wrist, from pose.kinematics
+        self.atlas = SpriteAtlas()
+
+    def on_pose_frame(self, pose):
+        kin = pose.kinematics
+        for row, (tracking_id, keypoints, valid) in enumerate(zip(pose.ids.tolist(), pose.keypoints, pose.valid)):
+            if tracking_id not in self.trails:
+                self.trails.track(tracking_id)
+                self.colors[tracking_id] = (
+                    random.randint(100, 255),
+                    random.randint(100, 255),
+                    random.randint(100, 255)
+                )
+
+            if valid and math.isfinite(keypoints[9, 0]) and math.isfinite(keypoints[9, 1]):
+                self.trails.get(tracking_id, 9).append(keypoints[9, 0], keypoints[9, 1])  # Left wrist
+                if kin is not None:
+                    self.velocity[tracking_id] = kin.velocity[row, 9]
+
+    def render(self, surface, t):
         surface.fill((0, 0, 0))  # Clear the surface
-        detections = user_data.detections
-        if not detections:
-            return
-
-        for detection in detections:
-            if detection.get_label() == "person" and detection.get_confidence() >= 0.5:
-                # Try to get tracking ID; use fallback if not available
-                track = detection.get_objects_typed(hailo.HAILO_UNIQUE_ID)
-                if track:
-                    tracking_id = track[0].get_id()
+        live = set(self.pose.ids.tolist())  # Glow only for people in the newest frame
+
+        width, height = surface.get_width(), surface.get_height()
+        stamps = []
+        for tracking_id, trails in self.trails.items():
+            trail = trails.get(9)
+            if tracking_id in live and trail is not None and len(trail) > 1:
+                prev_pos, new_pos = trail.to_screen(width, height)[-2:]
+                if tracking_id in self.velocity:
+                    # Shared kinematics are in screen units per second; 30 fps pixel steps as before
+                    vx, vy = self.velocity[tracking_id]
+                    speed = ((vx * width) ** 2 + (vy * height) ** 2) ** 0.5 / 30
                 else:
-                    tracking_id = id(detection)  # Temporary ID if tracking is not enabled
-
-                if tracking_id not in self.trails:
-                    self.trails[tracking_id] = {'wrist': []}
-                    self.colors[tracking_id] = (
-                        random.randint(100, 255),
-                        random.randint(100, 255),
-                        random.randint(100, 255)
-                    )
-
-                landmarks = detection.get_objects_typed(hailo.HAILO_LANDMARKS)
-                if landmarks:
-                    points = landmarks[0].get_points()
-                    wrist = points[9]  # Left wrist
-                    width, height = surface.get_width(), surface.get_height()
-                    new_pos = (int(wrist.x() * width), int(wrist.y() * height))
-
-                    if len(self.trails[tracking_id]['wrist']) > 0:
-                        prev_pos = self.trails[tracking_id]['wrist'][-1]
-                        speed = ((new_pos[0] - prev_pos[0]) ** 2 + (new_pos[1] - prev_pos[1]) ** 2) ** 0.5
-                        alpha = min(int(speed * 10), 255)
-                        color = self.colors[tracking_id] + (alpha,)
-                        pygame.draw.circle(surface, color, new_pos, 10)
-
-                    self.trails[tracking_id]['wrist'].append(new_pos)
-                    if len(self.trails[tracking_id]['wrist']) > self.max_trail_length:
-                        self.trails[tracking_id]['wrist'].pop(0)
+                    speed = float(((new_pos - prev_pos) ** 2).sum()) ** 0.5
+                alpha = min(int(speed * 10), 255)
+                stamps += self.atlas.items(new_pos[None], 10, self.colors[tracking_id], alpha)
+
+        surface.blits(stamps, doreturn=False)
 
 VisualClass = AccelerationGlowVisual
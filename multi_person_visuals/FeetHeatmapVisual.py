@@ -1,54 +1,33 @@
-import pygame
-import hailo
-import random
+from visual_api import Visual
+from heatmap import HeatmapGrid
 
-class FeetHeatmapVisual:
-    def __init__(self):
-        self.positions = {}  # {tracking_id: [(x, y), ...]}
-        self.colors = {}  # {tracking_id: color}
-        self.max_positions = 500
-
-    def visualize(self, user_data, surface):
-        surface.fill((0, 0, 0))  # Clear the surface
-        detections = user_data.detections
-        if not detections:
-            return
-
-        for detection in detections:
-            if detection.get_label() == "person" and detection.get_confidence() >= 0.5:
-                # Try to get tracking ID; use fallback if not available
-                track = detection.get_objects_typed(hailo.HAILO_UNIQUE_ID)
-                if track:
-                    tracking_id = track[0].get_id()
-                else:
-                    tracking_id = id(detection)  # Temporary ID if tracking is not enabled
+ORDER = 70  # position in the visual cycle
+REQUIRED_KEYPOINTS = (15, 16)  # COCO indices, see KEYPOINTS
 
-                if tracking_id not in self.positions:
-                    self.positions[tracking_id] = []
-                    self.colors[tracking_id] = (
-                        random.randint(100, 255),
-                        random.randint(100, 255),
-                        random.randint(100, 255)
-                    )
+class FeetHeatmapVisual(Visual):
+    required_keypoints = REQUIRED_KEYPOINTS
 
-                landmarks = detection.get_objects_typed(hailo.HAILO_LANDMARKS)
-                if landmarks:
-                    points = landmarks[0].get_points()
-                    left_ankle = points[15]  # Left ankle
-                    right_ankle = points[16]  # Right ankle
-                    width, height = surface.get_width(), surface.get_height()
-                    left_pos = (int(left_ankle.x() * width), int(left_ankle.y() * height))
-                    right_pos = (int(right_ankle.x() * width), int(right_ankle.y() * height))
-
-                    self.positions[tracking_id].append(left_pos)
-                    self.positions[tracking_id].append(right_pos)
-                    if len(self.positions[tracking_id]) > self.max_positions:
-                        self.positions[tracking_id].pop(0)
-
-        for tracking_id, pos_list in self.positions.items():
-            color = self.colors[tracking_id]
-            for i, pos in enumerate(pos_list):
-                alpha = max(255 - (len(pos_list) - i) * 5, 50)
-                pygame.draw.circle(surface, color + (alpha,), pos, 10)
+    def __init__(self):
+        super().__init__()
+        # Decaying density grid of ankle positions; memory is fixed however long it runs
+        self.heatmap = HeatmapGrid(size=(160, 90), half_life=3.0)
+        self.last_pose_t = None
+        self.last_time = None
+
+    def animating(self):
+        return self.heatmap.visible()  # Keeps fading out while anything is left
+
+    def on_pose_frame(self, pose):
+        dt = 1 / 30 if self.last_pose_t is None else min(max(pose.t - self.last_pose_t, 0.0), 0.5)
+        self.last_pose_t = pose.t
+        if len(pose):
+            # Weighted by the capture interval so the density does not depend on the frame rate
+            self.heatmap.splat(pose.keypoints[pose.valid, 15:17, :2], weight=dt * 30)  # Left / right ankle
+
+    def render(self, surface, t):
+        dt = 0.0 if self.last_time is None else min(t - self.last_time, 0.5)
+        self.last_time = t
+        self.heatmap.decay(dt)
+        surface.blit(self.heatmap.render(surface.get_size()), (0, 0))
 
 VisualClass = FeetHeatmapVisual
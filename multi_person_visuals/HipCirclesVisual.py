@@ -1,44 +1,46 @@
+import numpy as np
 import pygame
-import hailo
 import random
 import math
+from visual_api import Visual
+
+ORDER = 60  # position in the visual cycle
+REQUIRED_KEYPOINTS = (11, 12)  # COCO indices, see KEYPOINTS
+
+class HipCirclesVisual(Visual):
+    required_keypoints = REQUIRED_KEYPOINTS
 
-class HipCirclesVisual:
     def __init__(self):
-        self.colors = {}  # {tracking_id: color}
+        super().__init__()
+        self.colors = self.tracks.own({})  # {tracking_id: color}
+        self.pulsing = False  # circles on screen keep pulsing between pose frames
+
+    def animating(self):
+        return self.pulsing
 
-    def visualize(self, user_data, surface):
+    def on_pose_frame(self, pose):
+        self.pulsing = bool(pose.valid.any())
+        for tracking_id in pose.ids.tolist():
+            if tracking_id not in self.colors:
+                self.colors[tracking_id] = (
+                    random.randint(100, 255),
+                    random.randint(100, 255),
+                    random.randint(100, 255)
+                )
+
+    def render(self, surface, t):
         surface.fill((0, 0, 0))  # Clear the surface
-        detections = user_data.detections
-        if not detections:
+        pose = self.pose_at(t)  # Resampled to the display tick
+        if not len(pose):
             return
 
-        for detection in detections:
-            if detection.get_label() == "person" and detection.get_confidence() >= 0.5:
-                # Try to get tracking ID; use fallback if not available
-                track = detection.get_objects_typed(hailo.HAILO_UNIQUE_ID)
-                if track:
-                    tracking_id = track[0].get_id()
-                else:
-                    tracking_id = id(detection)  # Temporary ID if tracking is not enabled
-
-                if tracking_id not in self.colors:
-                    self.colors[tracking_id] = (
-                        random.randint(100, 255),
-                        random.randint(100, 255),
-                        random.randint(100, 255)
-                    )
-
-                landmarks = detection.get_objects_typed(hailo.HAILO_LANDMARKS)
-                if landmarks:
-                    points = landmarks[0].get_points()
-                    left_hip = points[11]  # Left hip
-                    right_hip = points[12]  # Right hip
-                    width, height = surface.get_width(), surface.get_height()
-                    hip_x = int((left_hip.x() + right_hip.x()) / 2 * width)
-                    hip_y = int((left_hip.y() + right_hip.y()) / 2 * height)
-
-                    radius = 20 + int(10 * math.sin(pygame.time.get_ticks() * 0.01))
-                    pygame.draw.circle(surface, self.colors[tracking_id], (hip_x, hip_y), radius, 3)
+        width, height = surface.get_width(), surface.get_height()
+        radius = 20 + int(10 * math.sin(t * 10))  # Pulse, ~1.6 Hz
+        for tracking_id, keypoints, valid in zip(pose.ids.tolist(), pose.keypoints, pose.valid):
+            if valid and tracking_id in self.colors and np.isfinite(keypoints[11:13, :2]).all():
+                hip = (keypoints[11, :2] + keypoints[12, :2]) / 2  # Mid point of left/right hip
+                hip_x, hip_y = int(hip[0] * width), int(hip[1] * height)
+
+                pygame.draw.circle(surface, self.colors[tracking_id], (hip_x, hip_y), radius, 3)
 
 VisualClass = HipCirclesVisual
@@ -1,57 +1,47 @@
-import pygame
-import hailo
 import random
+from visual_api import Visual
+from trail_buffer import TrailMap
+from polyline import PolylineRenderer
+
+ORDER = 40  # position in the visual cycle
+REQUIRED_KEYPOINTS = (9, 10)  # COCO indices, see KEYPOINTS
+
+class MotionTrailsMultipleVisual(Visual):
+    required_keypoints = REQUIRED_KEYPOINTS
 
-class MotionTrailsMultipleVisual:
     def __init__(self):
-        self.trails = {}  # {tracking_id: {'left_wrist': [], 'right_wrist': []}}
-        self.colors = {}  # {tracking_id: (left_color, right_color)}
+        super().__init__()
         self.max_trail_length = 30
-
-    def visualize(self, user_data, surface):
+        self.trails = self.tracks.own(TrailMap(self.max_trail_length))  # {tracking_id: {9: left_wrist, 10: right_wrist}}
+        self.colors = self.tracks.own({})  # {tracking_id: (left_color, right_color)}
+        self.renderer = PolylineRenderer()
+        self.fade = 0  # faded bands per trail, 0 = solid
+
+    def on_pose_frame(self, pose):
+        for tracking_id, keypoints, valid in zip(pose.ids.tolist(), pose.keypoints, pose.valid):
+            # Initialize trails and colors for new people
+            if tracking_id not in self.trails:
+                self.trails.track(tracking_id)
+                self.colors[tracking_id] = (
+                    (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255)),
+                    (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
+                )
+
+            # Update wrist trails (left = 9, right = 10)
+            if valid:
+                self.trails.push(tracking_id, keypoints, (9, 10))
+
+    def render(self, surface, t):
         surface.fill((0, 0, 0))  # Clear the surface
-        detections = user_data.detections
-        if not detections:
-            return
-
-        for detection in detections:
-            if detection.get_label() == "person" and detection.get_confidence() >= 0.5:
-                # Get tracking ID or use a fallback
-                track = detection.get_objects_typed(hailo.HAILO_UNIQUE_ID)
-                tracking_id = track[0].get_id() if track else id(detection)
-
-                # Initialize trails and colors for new people
-                if tracking_id not in self.trails:
-                    self.trails[tracking_id] = {'left_wrist': [], 'right_wrist': []}
-                    self.colors[tracking_id] = (
-                        (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255)),
-                        (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
-                    )
-
-                # Get wrist landmarks
-                landmarks = detection.get_objects_typed(hailo.HAILO_LANDMARKS)
-                if landmarks:
-                    points = landmarks[0].get_points()
-                    left_wrist = points[9]  # Left wrist
-                    right_wrist = points[10]  # Right wrist
-                    width, height = surface.get_width(), surface.get_height()
-                    left_pos = (int(left_wrist.x() * width), int(left_wrist.y() * height))
-                    right_pos = (int(right_wrist.x() * width), int(right_wrist.y() * height))
-
-                    # Update trails
-                    self.trails[tracking_id]['left_wrist'].append(left_pos)
-                    self.trails[tracking_id]['right_wrist'].append(right_pos)
-                    if len(self.trails[tracking_id]['left_wrist']) > self.max_trail_length:
-                        self.trails[tracking_id]['left_wrist'].pop(0)
-                    if len(self.trails[tracking_id]['right_wrist']) > self.max_trail_length:
-                        self.trails[tracking_id]['right_wrist'].pop(0)
 
         # Draw trails for all tracked people
+        width, height = surface.get_width(), surface.get_height()
+        lines = []
         for tracking_id, trails in self.trails.items():
             left_color, right_color = self.colors[tracking_id]
-            for i in range(1, len(trails['left_wrist'])):
-                pygame.draw.line(surface, left_color, trails['left_wrist'][i-1], trails['left_wrist'][i], 5)
-            for i in range(1, len(trails['right_wrist'])):
-                pygame.draw.line(surface, right_color, trails['right_wrist'][i-1], trails['right_wrist'][i], 5)
+            for kp, color in ((9, left_color), (10, right_color)):
+                if kp in trails:
+                    lines.append((trails[kp].to_screen(width, height), color))
+        self.renderer.draw(surface, lines, 5, self.fade)
 
 VisualClass = MotionTrailsMultipleVisual
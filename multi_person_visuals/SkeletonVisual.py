@@ -1,10 +1,17 @@
+import numpy as np
 import pygame
-import hailo
 import random
+from visual_api import Visual
+
+ORDER = 10  # position in the visual cycle
+REQUIRED_KEYPOINTS = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16)  # COCO indices, see KEYPOINTS
+
+class SkeletonVisual(Visual):
+    required_keypoints = REQUIRED_KEYPOINTS
 
-class SkeletonVisual:
     def __init__(self):
-        self.colors = {}  # {tracking_id: color}
+        super().__init__()
+        self.colors = self.tracks.own({})  # {tracking_id: color}
         self.connections = [
             (0, 1), (1, 2), (2, 3), (3, 4),  # Head
             (0, 5), (5, 6), (6, 7), (7, 9),  # Left arm
@@ -14,35 +21,29 @@ class SkeletonVisual:
             (12, 14), (14, 16)  # Right leg
         ]
 
-    def visualize(self, user_data, surface):
+    def on_pose_frame(self, pose):
+        for tracking_id in pose.ids.tolist():
+            if tracking_id not in self.colors:
+                self.colors[tracking_id] = (
+                    random.randint(100, 255),
+                    random.randint(100, 255),
+                    random.randint(100, 255)
+                )
+
+    def render(self, surface, t):
         surface.fill((0, 0, 0))  # Clear the surface
-        detections = user_data.detections
-        if not detections:
+        pose = self.pose_at(t)  # Resampled to the display tick
+        if not len(pose):
             return
 
-        for detection in detections:
-            if detection.get_label() == "person" and detection.get_confidence() >= 0.5:
-                # Try to get tracking ID; use fallback if not available
-                track = detection.get_objects_typed(hailo.HAILO_UNIQUE_ID)
-                if track:
-                    tracking_id = track[0].get_id()
-                else:
-                    tracking_id = id(detection)  # Temporary ID if tracking is not enabled
-
-                if tracking_id not in self.colors:
-                    self.colors[tracking_id] = (
-                        random.randint(100, 255),
-                        random.randint(100, 255),
-                        random.randint(100, 255)
-                    )
-
-                landmarks = detection.get_objects_typed(hailo.HAILO_LANDMARKS)
-                if landmarks:
-                    points = landmarks[0].get_points()
-                    width, height = surface.get_width(), surface.get_height()
-                    scaled_points = [(int(p.x() * width), int(p.y() * height)) for p in points]
-
-                    for p1, p2 in self.connections:
+        width, height = surface.get_width(), surface.get_height()
+        for tracking_id, keypoints, valid in zip(pose.ids.tolist(), pose.keypoints, pose.valid):
+            if valid and tracking_id in self.colors:
+                present = np.isfinite(keypoints[:, :2]).all(1)
+                scaled_points = np.nan_to_num(keypoints[:, :2] * (width, height)).astype(int).tolist()
+
+                for p1, p2 in self.connections:
+                    if present[p1] and present[p2]:  # Skip keypoints this frame did not decode
                         pygame.draw.line(surface, self.colors[tracking_id], scaled_points[p1], scaled_points[p2], 3)
 
 VisualClass = SkeletonVisual
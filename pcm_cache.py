@@ -0,0 +1,81 @@
+# pcm_cache.py – decode-once, memory-mapped PCM for the looping visual sounds
+
+import os, struct
+from typing import NamedTuple
+import numpy as np
+
+WAVE_PCM, WAVE_FLOAT, WAVE_EXTENSIBLE = 0x0001, 0x0003, 0xFFFE
+
+class Pcm(NamedTuple):
+    data: np.ndarray               # (frames, channels) int16 memmap, or float32 in −1…1
+    rate: int
+    channels: int
+
+def _chunks(path:str)->tuple[bytes, int, int]:
+    """('fmt ' chunk, byte offset, byte size of the 'data' chunk)."""
+    fmt = None
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if len(head) < 12 or head[:4] != b"RIFF" or head[8:] != b"WAVE":
+            raise ValueError(f"{path}: not a WAV file")
+        while True:
+            hdr = f.read(8)
+            if len(hdr) < 8: raise ValueError(f"{path}: no data chunk")
+            cid, size = struct.unpack("<4sI", hdr)
+            if cid == b"data":
+                if fmt is None or len(fmt) < 16: raise ValueError(f"{path}: no fmt chunk")
+                return fmt, f.tell(), size
+            if cid == b"fmt ": fmt = f.read(size); f.seek(size & 1, 1)
+            else: f.seek(size + (size & 1), 1)     # chunks are word aligned
+
+def _decode(raw:np.ndarray, tag:int, width:int)->np.ndarray:
+    """Flat float32 samples in −1…1 from the bytes of a PCM or float WAV."""
+    if tag == WAVE_FLOAT and width in (4, 8):
+        return raw.view({4: "<f4", 8: "<f8"}[width]).astype(np.float32)
+    if tag != WAVE_PCM or width not in (1, 3, 4): raise ValueError(f"format {tag:#x}, {8 * width}-bit")
+    if width == 1:
+        x = raw.astype(np.float32) - 128
+    elif width == 3:               # little-endian 24-bit → top of an int32
+        b = raw.reshape(-1, 3).astype(np.int32)
+        x = ((b[:, 0] << 8) | (b[:, 1] << 16) | (b[:, 2] << 24)).astype(np.float32) / 256
+    else:
+        x = raw.view("<i4").astype(np.float32)
+    return x / float(1 << (8 * width - 1))
+
+def read_pcm(path:str)->Pcm:
+    """Map a 16-bit PCM WAV (pages shared, only touched while playing);
+    8/24/32-bit PCM and 32/64-bit float WAVs are decoded to float32."""
+    fmt, off, size = _chunks(path)
+    tag, ch, rate, _, align, _ = struct.unpack("<HHIIHH", fmt[:16])
+    if tag == WAVE_EXTENSIBLE and len(fmt) >= 26: tag = struct.unpack("<H", fmt[24:26])[0]
+    if not ch or align % ch: raise ValueError(f"{path}: bad fmt chunk")
+    width = align // ch
+    n = min(size, os.path.getsize(path) - off) // align
+    if tag == WAVE_PCM and width == 2:
+        return Pcm(np.memmap(path, "<i2", "r", off, (n, ch)), rate, ch)
+    raw = np.fromfile(path, np.uint8, n * align, offset=off)
+    try:
+        data = _decode(raw, tag, width).reshape(n, ch)
+    except ValueError as err:
+        raise ValueError(f"{path}: {err}") from None
+    data.setflags(write=False)
+    return Pcm(data, rate, ch)
+
+def samples(pcm:Pcm)->np.ndarray:
+    """(frames, channels) float32 in −1…1."""
+    if pcm.data.dtype == np.float32: return pcm.data
+    return pcm.data.astype(np.float32) * np.float32(1 / 32768)
+
+class PcmCache:
+    """path → Pcm, re-read only when the file's mtime or size changes."""
+    def __init__(self):
+        self._items = {}           # path → ((mtime_ns, size), Pcm)
+
+    def get(self, path:str)->Pcm:
+        st  = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        hit = self._items.get(path)
+        if hit is not None and hit[0] == key: return hit[1]
+        pcm = read_pcm(path)
+        self._items[path] = (key, pcm)
+        return pcm
@@ -0,0 +1,68 @@
+# plugin_watch.py – background watcher reporting edited visual plugin files
+
+import os, threading
+try:
+    from inotify_simple import INotify, flags
+except ImportError:                # polling fallback
+    INotify = None
+
+class PluginWatcher:
+    """Collects changed *Visual.py files on a daemon thread.
+
+    Uses inotify (inotify_simple) when available, otherwise stats the
+    directory every `interval` seconds.  The render loop drains changes()
+    between frames and does the actual reload, so nothing is swapped while a
+    visual is drawing.
+    """
+    def __init__(self, directory:str, suffix:str="Visual.py", interval:float=0.5):
+        self.directory, self.suffix, self.interval = directory, suffix, interval
+        self._changed = set()
+        self._lock    = threading.Lock()
+        self._stop    = threading.Event()
+        self._thread  = None
+
+    def start(self)->threading.Thread:
+        run = self._run_inotify if INotify is not None else self._run_poll
+        self._thread = threading.Thread(target=run, name="plugin-watch", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+    def changes(self)->list[str]:
+        """Paths changed since the last call (each once)."""
+        with self._lock:
+            out, self._changed = sorted(self._changed), set()
+        return out
+
+    def _report(self, fn:str):
+        if fn.endswith(self.suffix):
+            with self._lock: self._changed.add(os.path.join(self.directory, fn))
+
+    def _run_inotify(self):
+        ino = INotify()
+        # editors either rewrite in place or rename a temp file over the original
+        ino.add_watch(self.directory, flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE)
+        while not self._stop.is_set():
+            for ev in ino.read(timeout=int(self.interval * 1000)):
+                self._report(ev.name)
+
+    def _stamps(self)->dict:
+        out = {}
+        for fn in os.listdir(self.directory):
+            if not fn.endswith(self.suffix): continue
+            try:
+                st = os.stat(os.path.join(self.directory, fn))
+                out[fn] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass               # deleted between listdir and stat
+        return out
+
+    def _run_poll(self):
+        seen = self._stamps()
+        while not self._stop.wait(self.interval):
+            now = self._stamps()
+            for fn, stamp in now.items():
+                if seen.get(fn) != stamp: self._report(fn)
+            seen = now
@@ -0,0 +1,51 @@
+# polyline.py – batched trail drawing: one pygame.draw.lines per trail (per fade band)
+
+import pygame
+
+class PolylineRenderer:
+    """Draws whole point arrays per trail instead of one draw.line per segment.
+
+    With fade=0 every trail is a single pygame.draw.lines call.  With fade=k
+    the oldest part of each trail is split into k bands; band i is drawn
+    opaque in the trail colour mixed (i+1)/(k+1) of the way from background,
+    which is what an alpha blend over a cleared panel gives without the
+    per-pixel cost of alpha layers.  Cost is trails×(k+1) draw calls per
+    frame and nothing else, independent of trail length and panel size.
+    """
+    def __init__(self):
+        self._mix  = {}            # (colour, fade, background) → band colours, faintest first
+        self.calls = 0             # draw calls of the last draw()
+
+    def _bands(self, color, fade, background):
+        key = (color, fade, background)
+        cols = self._mix.get(key)
+        if cols is None:
+            if len(self._mix) > 1024: self._mix.clear()    # trail colours come and go with people
+            cols = self._mix[key] = [tuple(int(b + (c - b) * (i + 1) / (fade + 1))
+                                           for c, b in zip(color[:3], background))
+                                     for i in range(fade)]
+        return cols
+
+    def draw(self, surface, trails, width:int=5, fade:int=0, background=(0, 0, 0))->int:
+        """Draw (points, colour) pairs; points is an (n, 2) int array oldest→newest.
+
+        background is the colour the surface was cleared to (faded bands mix toward it).
+        """
+        calls = 0
+        for pts, color in trails:
+            n = len(pts)
+            if n < 2: continue
+            start = 0
+            if fade:
+                # band edges over point indices; neighbouring bands share an end point
+                edges = [(n - 1) * i // (fade + 1) for i in range(fade + 2)]
+                for band, col in enumerate(self._bands(tuple(color), fade, tuple(background))):
+                    a, b = edges[band], edges[band + 1]
+                    if b <= a: continue
+                    pygame.draw.lines(surface, col, False, pts[a:b + 1], width); calls += 1
+                start = edges[fade]
+            if n - start < 2: continue
+            # the opaque newest band goes on top of the faded history
+            pygame.draw.lines(surface, color, False, pts[start:], width); calls += 1
+        self.calls = calls
+        return calls
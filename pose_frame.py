@@ -0,0 +1,117 @@
+# pose_frame.py – decode-once struct-of-arrays pose frame shared by visuals and audio
+
+import time
+import numpy as np
+try:
+    import hailo                   # only needed to decode live buffers
+except ImportError:
+    hailo = None
+
+NUM_KP   = 17                      # COCO keypoints, see KEYPOINTS
+CONF_THR = 0.5
+
+class PoseFrame:
+    """Immutable snapshot of every confident person in one buffer.
+
+    keypoints (N, 17, 3) float32   x, y, confidence (normalised coords)
+    bboxes    (N, 4)     float32   xmin, ymin, xmax, ymax
+    ids       (N,)       int64     HAILO_UNIQUE_ID, or detection index if untracked
+    scores    (N,)       float32   detection confidence
+    t         float                capture time, time.monotonic() seconds
+
+    People without landmarks keep a row of NaN coordinates; see `valid`.
+    Keypoints that were not decoded (see decode_detections' kp_idx) are NaN too.
+
+    Frames from the tracker may also carry, per keypoint,
+    raw_keypoints (N, 17, 3)  the detector's values before smoothing
+    velocity      (N, 17, 2)  vx, vy – filtered keypoint velocity, units/s
+    kinematics    kinematics.MotionFeatures – velocity, acceleration, jerk, energy
+    so a consumer picks its trade-off: keypoints (smoothed), raw() (no
+    added lag, full jitter) or predicted(t) (latency-compensated).
+    """
+    __slots__ = ("keypoints", "bboxes", "ids", "scores", "t", "raw_keypoints", "velocity", "kinematics")
+
+    def __init__(self, keypoints, bboxes, ids, scores, t:float=0.0,
+                 raw_keypoints=None, velocity=None, kinematics=None):
+        for name, arr in zip(self.__slots__, (keypoints, bboxes, ids, scores)):
+            arr.setflags(write=False)
+            object.__setattr__(self, name, arr)
+        object.__setattr__(self, "t", t)
+        for name, arr in (("raw_keypoints", raw_keypoints), ("velocity", velocity)):
+            if arr is not None: arr.setflags(write=False)
+            object.__setattr__(self, name, arr)
+        object.__setattr__(self, "kinematics", kinematics)
+
+    def __setattr__(self, *_):
+        raise AttributeError("PoseFrame is immutable")
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def valid(self)->np.ndarray:
+        """(N,) bool – rows that carry landmarks."""
+        return ~np.isnan(self.keypoints[:, :, 0]).all(1)
+
+    def raw(self)->"PoseFrame":
+        """The unsmoothed detector keypoints (self if there are none)."""
+        if self.raw_keypoints is None: return self
+        return PoseFrame(self.raw_keypoints, self.bboxes, self.ids, self.scores, self.t,
+                         None, self.velocity, self.kinematics)
+
+    def predicted(self, t:float)->"PoseFrame":
+        """Keypoints and boxes moved along `velocity` from self.t to t (self without it).
+
+        The smoothed keypoints are the starting point, so a still pose stays
+        as steady as `keypoints`.
+        """
+        if self.velocity is None or not len(self): return self
+        step = self.velocity * np.float32(t - self.t)
+        kps = self.keypoints.copy()
+        kps[:, :, :2] += step      # NaN keypoints stay NaN
+        present = ~np.isnan(self.keypoints[:, :, :1])
+        shift = np.where(present, step, 0).sum(1) / np.maximum(present.sum(1), 1)
+        return PoseFrame(kps, self.bboxes + np.tile(shift, 2), self.ids, self.scores, t,
+                         self.raw_keypoints, self.velocity, self.kinematics)
+
+def empty_frame(t:float=0.0)->PoseFrame:
+    return PoseFrame(np.zeros((0, NUM_KP, 3), np.float32), np.zeros((0, 4), np.float32),
+                     np.zeros(0, np.int64), np.zeros(0, np.float32), t)
+
+EMPTY = empty_frame()
+
+def decode_detections(dets, conf_thr:float=CONF_THR, t:float=0.0, kp_idx=None)->PoseFrame:
+    """Walk the hailo detections once; every other consumer reads the arrays.
+
+    kp_idx limits the landmarks read to those indices (None = all 17).
+    """
+    kps, boxes, ids, scores = [], [], [], []
+    for i, d in enumerate(dets):
+        if d.get_label() != "person": continue
+        score = d.get_confidence()
+        if score < conf_thr: continue
+        track = d.get_objects_typed(hailo.HAILO_UNIQUE_ID)
+        ids.append(track[0].get_id() if track else i)
+        b = d.get_bbox()
+        boxes.append((b.xmin(), b.ymin(), b.xmax(), b.ymax()))
+        scores.append(score)
+        row = np.full((NUM_KP, 3), np.nan, np.float32); row[:, 2] = 0
+        lms = d.get_objects_typed(hailo.HAILO_LANDMARKS)
+        if lms:
+            pts = lms[0].get_points()[:NUM_KP]
+            if kp_idx is None:
+                row[:len(pts)] = [(p.x(), p.y(), p.confidence()) for p in pts]
+            else:
+                for k in kp_idx:
+                    if k < len(pts): p = pts[k]; row[k] = (p.x(), p.y(), p.confidence())
+        kps.append(row)
+    if not ids: return empty_frame(t) if t else EMPTY
+    return PoseFrame(np.stack(kps), np.asarray(boxes, np.float32),
+                     np.asarray(ids, np.int64), np.asarray(scores, np.float32), t)
+
+def get_pose_frame(user_data)->PoseFrame:
+    """Pose frame published by the callback; decodes raw detections for older scripts."""
+    pose = getattr(user_data, "pose", None)
+    if pose is None:
+        pose = decode_detections(getattr(user_data, "detections", None) or [], t=time.monotonic())
+    return pose
@@ -0,0 +1,62 @@
+# prediction.py – batched constant-velocity Kalman filter for keypoint extrapolation
+
+import numpy as np
+
+class ConstantVelocity:
+    """Kalman filter with a (position, velocity) state per keypoint coordinate.
+
+    Every coordinate of every keypoint of every track is an independent
+    2-state filter driven by white acceleration noise (accel, units/s²/√Hz)
+    and observed with noise (noise, normalised units); x and y share one
+    2×2 covariance, stored as its three entries.  Like smoothing.OneEuro it
+    is stateless: the caller keeps state (M, K, 4) = x, y, vx, vy and
+    cov (M, K, 3) = Ppp, Ppv, Pvv per track, and one call costs a fixed
+    number of NumPy ops for all of them.  velocity() is what
+    PoseFrame.predicted() extrapolates the smoothed keypoints with; its soft
+    deadband keeps velocity noise from shaking a still pose.
+    """
+    def __init__(self, accel:float=2.0, noise:float=0.01, max_speed:float=10.0, deadband:float=0.3):
+        self.q, self.r = accel ** 2, noise ** 2
+        self.deadband = deadband             # units/s below which velocity fades out
+        self.v0 = max_speed ** 2             # velocity variance of a fresh track
+
+    def init(self, z:np.ndarray)->tuple[np.ndarray, np.ndarray]:
+        """State and covariance of tracks first observed at z (M, K, 2)."""
+        state = np.concatenate((z, np.zeros_like(z)), 2).astype(np.float32)
+        cov = np.empty(z.shape[:2] + (3,), np.float32); cov[...] = (self.r, 0.0, self.v0)
+        return state, cov
+
+    def __call__(self, z:np.ndarray, state:np.ndarray, cov:np.ndarray,
+                 dt:np.ndarray)->tuple[np.ndarray, np.ndarray]:
+        """Predict by dt (M,) seconds, then correct with z (M, K, 2).
+
+        Keypoints missing (NaN) now restart when next seen; ones missing
+        before start fresh from z.
+        """
+        dt = np.maximum(dt, 1e-3)[:, None]
+        q, r = self.q, self.r
+        p, v = state[..., :2], state[..., 2:]
+        ppp, ppv, pvv = cov[..., 0], cov[..., 1], cov[..., 2]
+        # predict
+        p = p + v * dt[..., None]
+        ppp = ppp + dt * (2 * ppv + dt * pvv) + q * dt ** 3 / 3
+        ppv = ppv + dt * pvv + q * dt ** 2 / 2
+        pvv = pvv + q * dt
+        # correct
+        s = ppp + r
+        kp, kv = (ppp / s)[..., None], (ppv / s)[..., None]
+        y = z - p
+        p, v = p + kp * y, v + kv * y
+        ppp, ppv, pvv = ppp * (1 - kp[..., 0]), ppv * (1 - kp[..., 0]), pvv - kv[..., 0] * ppv
+        new_state = np.concatenate((p, v), 2).astype(np.float32)
+        new_cov = np.stack((ppp, ppv, pvv), 2).astype(np.float32)
+        fresh = np.isnan(state[..., 0]) | np.isnan(z[..., 0])
+        if fresh.any():
+            new_state[fresh], new_cov[fresh] = (a[fresh] for a in self.init(z))
+        return new_state, new_cov
+
+    def velocity(self, state:np.ndarray)->np.ndarray:
+        """(M, K, 2) filtered velocity, scaled by |v|²/(|v|² + deadband²)."""
+        v = state[..., 2:]
+        v2 = (v * v).sum(2, keepdims=True)
+        return np.nan_to_num(v * (v2 / (v2 + self.deadband ** 2 + 1e-12))).astype(np.float32)
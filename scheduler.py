@@ -0,0 +1,124 @@
+# scheduler.py – decoupled render / inference clocks: rate meters and pose resampling
+
+import time
+from typing import NamedTuple
+import numpy as np, pygame
+from pose_frame import PoseFrame, EMPTY
+
+class RenderView(NamedTuple):
+    """What one render tick draws: resampled pose, trails and the camera frame.
+
+    frame_pose is the pose as captured, not resampled – overlays on the
+    camera frame use it so they stay on the image they were detected in.
+    """
+    pose: PoseFrame
+    person_trails: object
+    frame: np.ndarray | None
+    frame_pose: PoseFrame | None = None
+
+def display_hz(default:int=60)->int:
+    """Monitor refresh rate where pygame exposes it, else default.
+
+    Only pygame-ce reports the rate (get_current_refresh_rate once a window
+    is open, get_desktop_refresh_rates before).  The pinned pygame 2.6 has
+    neither, so there the render loop is capped at a fixed default – 60 Hz,
+    what the Pi drives HDMI panels at unless configured otherwise.
+    """
+    hz = 0
+    try:
+        get = getattr(pygame.display, "get_current_refresh_rate", None)
+        if get and pygame.display.get_surface() is not None: hz = get()
+        rates = getattr(pygame.display, "get_desktop_refresh_rates", None)
+        if not hz and rates: hz = (rates() or [0])[0]
+    except pygame.error:
+        hz = 0
+    return hz if hz and hz > 0 else default
+
+class Ema:
+    """Exponential moving average; first sample seeds it."""
+    def __init__(self, alpha:float=0.1):
+        self.alpha, self.value = alpha, None
+
+    def add(self, x:float)->float:
+        self.value = x if self.value is None else self.value + (x - self.value) * self.alpha
+        return self.value
+
+class RateMeter:
+    """Events per second from event timestamps (seconds)."""
+    def __init__(self, alpha:float=0.1):
+        self._dt, self._last = Ema(alpha), None
+
+    def tick(self, t:float|None=None):
+        t = time.monotonic() if t is None else t
+        if self._last is not None and t > self._last: self._dt.add(t - self._last)
+        self._last = t
+
+    @property
+    def interval(self)->float|None:
+        return self._dt.value
+
+    @property
+    def fps(self)->float:
+        return 1.0 / self._dt.value if self._dt.value else 0.0
+
+def blend(prev:PoseFrame, cur:PoseFrame, alpha:float, t:float)->PoseFrame:
+    """cur with every person also present in prev moved to prev + alpha·(cur − prev)."""
+    if not len(prev) or not len(cur): return cur
+    ci, pi = np.nonzero(cur.ids[:, None] == prev.ids[None, :])
+    kps, boxes = cur.keypoints.copy(), cur.bboxes.copy()
+    a = np.float32(alpha)
+    kps[ci, :, :2]  = prev.keypoints[pi, :, :2] + a * (cur.keypoints[ci, :, :2] - prev.keypoints[pi, :, :2])
+    boxes[ci]       = prev.bboxes[pi] + a * (cur.bboxes[ci] - prev.bboxes[pi])
+    return PoseFrame(kps, boxes, cur.ids, cur.scores, t)
+
+class PoseClock:
+    """Resamples pose frames (inference rate) at render time.
+
+    push() is called from the render thread whenever a new pose frame is
+    published; sample(now) returns the pose for this display tick.
+      "interpolate" – over the inference interval after a frame arrives,
+                      glides from the previous frame to it (smooth, +1 frame).
+      "extrapolate" – projects the newest frame from its capture time to
+                      now using the velocity between the two newest frames,
+                      at most max_extrapolate seconds ahead (may overshoot).
+      "predict"     – like extrapolate, with the tracker's per-keypoint
+                      filtered velocities (PoseFrame.predicted); frames
+                      without them fall back to extrapolate.
+    Frame times are capture times (PoseFrame.t, monotonic seconds).  To
+    compensate display latency, sample at the time the frame will be seen.
+    """
+    def __init__(self, mode:str="interpolate", max_extrapolate:float=0.05):
+        if mode not in ("interpolate", "extrapolate", "predict"): raise ValueError(f"unknown mode {mode!r}")
+        self.mode            = mode
+        self.max_extrapolate = max_extrapolate
+        self.prev = self.cur = EMPTY
+        self.arrived = 0.0
+        self.rate = RateMeter()    # inference rate, from capture times
+
+    def push(self, pose:PoseFrame, now:float|None=None):
+        if pose is self.cur: return
+        self.prev, self.cur = self.cur, pose
+        self.arrived = time.monotonic() if now is None else now
+        self.rate.tick(pose.t)
+
+    def moving(self, now:float)->bool:
+        """Would sample(now) still differ from the newest frame's resting pose?"""
+        if self.mode == "predict" and self.cur.velocity is not None:
+            return len(self.cur) > 0 and now < self.cur.t + self.max_extrapolate
+        if not len(self.prev) or not len(self.cur) or self.cur.t <= self.prev.t: return False
+        if self.mode == "interpolate":
+            return now - self.arrived < (self.rate.interval or self.cur.t - self.prev.t)
+        return now < self.cur.t + self.max_extrapolate
+
+    def sample(self, now:float)->PoseFrame:
+        prev, cur = self.prev, self.cur
+        if self.mode == "predict" and cur.velocity is not None:
+            return cur.predicted(max(cur.t, min(now, cur.t + self.max_extrapolate)))
+        span = cur.t - prev.t
+        if not len(cur) or span <= 0: return cur
+        if self.mode == "interpolate":
+            alpha = min(1.0, (now - self.arrived) / (self.rate.interval or span))
+        else:
+            alpha = (min(now, cur.t + self.max_extrapolate) - prev.t) / span
+        alpha = max(0.0, alpha)
+        return cur if alpha == 1.0 else blend(prev, cur, alpha, prev.t + alpha * span)
@@ -0,0 +1,36 @@
+# smoothing.py – vectorised One-Euro filter for stacked keypoint arrays
+
+import numpy as np
+from pose_frame import NUM_KP
+
+def smoothing_factor(cutoff, dt):
+    """Exponential-smoothing weight of a first-order low-pass at cutoff Hz over dt s."""
+    return 1.0 / (1.0 + 1.0 / (2 * np.pi * cutoff * dt))
+
+class OneEuro:
+    """One-Euro filter (Casiez et al., CHI 2012) over (M, K, 2) keypoints at once.
+
+    The cutoff rises with speed – min_cutoff + beta·|ẋ| – so a still pose
+    loses its jitter while fast limbs keep up without lag.  min_cutoff (Hz)
+    and beta (Hz per normalised-unit/s) are scalars or one value per
+    keypoint.  The filter itself is stateless: the caller keeps each track's
+    previous output and derivative (the tracker holds them per track), so
+    one call costs a fixed number of NumPy ops however many people there are.
+    """
+    def __init__(self, min_cutoff=1.0, beta=4.0, d_cutoff:float=1.0):
+        per_kp = lambda v: np.broadcast_to(np.asarray(v, np.float32), (NUM_KP,))[:, None].copy()
+        self.min_cutoff, self.beta, self.d_cutoff = per_kp(min_cutoff), per_kp(beta), d_cutoff
+
+    def __call__(self, x:np.ndarray, x_prev:np.ndarray, dx_prev:np.ndarray,
+                 dt:np.ndarray)->tuple[np.ndarray, np.ndarray]:
+        """Filter x given the previous outputs; dt is (M,) seconds.  Returns (x̂, ẋ̂).
+
+        A keypoint missing (NaN) now or before restarts from the raw value.
+        """
+        dt = np.maximum(dt, 1e-3)[:, None, None]
+        dx = dx_prev + smoothing_factor(self.d_cutoff, dt) * ((x - x_prev) / dt - dx_prev)
+        cutoff = self.min_cutoff + self.beta * np.sqrt((dx * dx).sum(2, keepdims=True))
+        out = x_prev + smoothing_factor(cutoff, dt) * (x - x_prev)
+        fresh = np.isnan(x[..., :1]) | np.isnan(x_prev[..., :1])
+        return (np.where(fresh, x, out).astype(np.float32),
+                np.where(fresh, 0.0, dx).astype(np.float32))
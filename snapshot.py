@@ -0,0 +1,30 @@
+# snapshot.py – versioned single-reference publication from the gst thread to the render loop
+
+from typing import NamedTuple
+from pose_frame import PoseFrame, EMPTY
+
+class Snapshot(NamedTuple):
+    """Complete, immutable state of one processed buffer."""
+    seq: int                       # 0 = nothing published yet
+    pose: PoseFrame
+    trails: dict                   # {pid: {kp: (n, 2) read-only float32}}
+
+class SnapshotBox:
+    """One producer publishes, any number of consumers read – no locks.
+
+    The producer builds every part of the next Snapshot off to the side and
+    publishes it by rebinding a single attribute, which is atomic under the
+    GIL.  A consumer calls get() once per tick and works only on what it got,
+    so it can never see a half-updated dict; comparing seq tells it whether
+    anything changed since its last tick.
+    """
+    def __init__(self):
+        self._snap = Snapshot(0, EMPTY, {})
+
+    def publish(self, pose:PoseFrame, trails:dict)->Snapshot:
+        snap = Snapshot(self._snap.seq + 1, pose, trails)
+        self._snap = snap
+        return snap
+
+    def get(self)->Snapshot:
+        return self._snap
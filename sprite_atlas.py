@@ -0,0 +1,44 @@
+# sprite_atlas.py – LRU cache of pre-rendered SRCALPHA circle stamps for batched blits
+
+from collections import OrderedDict
+import numpy as np, pygame
+
+class SpriteAtlas:
+    """Circle sprites keyed by (radius, colour, alpha bucket).
+
+    pygame.draw.circle with an RGBA colour on an opaque Surface ignores the
+    alpha, and one call per point is a Python→C round trip each.  Stamping
+    pre-rendered SRCALPHA sprites through Surface.blits() gets real alpha
+    blending and a single C-level call for the whole batch.
+    """
+    def __init__(self, max_sprites:int=256, buckets:int=16):
+        self.max_sprites = max_sprites
+        self.buckets     = buckets
+        self._sprites    = OrderedDict()
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def sprite(self, radius:int, color, bucket:int)->pygame.Surface:
+        key = (radius, tuple(color[:3]), bucket)
+        s = self._sprites.get(key)
+        if s is not None:
+            self._sprites.move_to_end(key)
+            return s
+        alpha = round(255 * bucket / (self.buckets - 1))
+        s = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+        pygame.draw.circle(s, tuple(color[:3]) + (alpha,), (radius, radius), radius)
+        if pygame.display.get_surface(): s = s.convert_alpha()
+        self._sprites[key] = s
+        if len(self._sprites) > self.max_sprites: self._sprites.popitem(last=False)
+        return s
+
+    def items(self, centers, radius:int, color, alphas)->list:
+        """(sprite, topleft) pairs for an (n, 2) int array of centres and (n,) alphas 0-255."""
+        centers = np.asarray(centers)
+        if not len(centers): return []
+        b = np.rint(np.clip(alphas, 0, 255) * ((self.buckets - 1) / 255)).astype(int)
+        b = np.broadcast_to(b, (len(centers),))
+        lut = {k: self.sprite(radius, color, k) for k in np.unique(b).tolist()}
+        return list(zip(map(lut.__getitem__, b.tolist()), (centers - radius).tolist()))
+
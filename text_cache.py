@@ -0,0 +1,63 @@
+# text_cache.py – LRU cache of rendered text surfaces and a change-tracked HUD overlay
+
+from collections import OrderedDict
+import pygame
+
+class TextCache:
+    """font.render results keyed by (string, colour, size), bounded LRU.
+
+    HUD strings change only on key presses, so rasterising them every frame
+    is pure waste; fonts are opened once per size as well.
+    """
+    def __init__(self, max_items:int=128, font_name=None):
+        self.max_items = max_items
+        self.font_name = font_name
+        self._fonts    = {}
+        self._surfs    = OrderedDict()
+
+    def font(self, size:int)->pygame.font.Font:
+        f = self._fonts.get(size)
+        if f is None: f = self._fonts[size] = pygame.font.Font(self.font_name, size)
+        return f
+
+    def render(self, text:str, color, size:int=36)->pygame.Surface:
+        key = (text, tuple(color), size)
+        s = self._surfs.get(key)
+        if s is not None:
+            self._surfs.move_to_end(key)
+            return s
+        s = self.font(size).render(text, True, color)
+        self._surfs[key] = s
+        if len(self._surfs) > self.max_items: self._surfs.popitem(last=False)
+        return s
+
+class Hud:
+    """Overlay of positioned text items, re-rendered only when they change.
+
+    draw() composites the overlay only inside the given rects (the areas
+    that were just repainted), clipped, so text is never blended twice over
+    the same background.
+    """
+    def __init__(self, cache:TextCache, color, size:int=36):
+        self.cache, self.color, self.size = cache, color, size
+        self._items = ()
+        self._layer = []           # [(surface, rect)]
+
+    def set(self, items)->bool:
+        """items: ((text, x, y), ...); returns True if the overlay changed."""
+        items = tuple(items)
+        if items == self._items: return False
+        self._items = items
+        self._layer = []
+        for text, x, y in items:
+            s = self.cache.render(text, self.color, self.size)
+            self._layer.append((s, s.get_rect(topleft=(x, y))))
+        return True
+
+    def draw(self, surface, rects):
+        clip = surface.get_clip()
+        for r in rects:
+            surface.set_clip(r)
+            for s, sr in self._layer:
+                if sr.colliderect(r): surface.blit(s, sr)
+        surface.set_clip(clip)
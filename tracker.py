@@ -0,0 +1,176 @@
+# tracker.py – stable person ids from IoU + keypoint-OKS association with birth/death hysteresis
+
+import numpy as np
+from pose_frame import PoseFrame, NUM_KP, empty_frame
+from smoothing import OneEuro
+from prediction import ConstantVelocity
+from kinematics import Kinematics, MotionFeatures
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:                # greedy matching without scipy
+    linear_sum_assignment = None
+
+# COCO per-keypoint OKS falloff (sigmas), nose … right ankle
+OKS_SIGMAS = np.array([.026, .025, .025, .035, .035, .079, .079, .072, .072,
+                       .062, .062, .107, .107, .087, .087, .089, .089], np.float32)
+
+def iou_matrix(a:np.ndarray, b:np.ndarray)->np.ndarray:
+    """(A, B) IoU of xmin, ymin, xmax, ymax boxes."""
+    lt = np.maximum(a[:, None, :2], b[None, :, :2])
+    rb = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.clip(rb - lt, 0, None).prod(2)
+    area = lambda x: np.clip(x[:, 2:] - x[:, :2], 0, None).prod(1)
+    union = area(a)[:, None] + area(b)[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-12), 0.0)
+
+def oks_matrix(ka:np.ndarray, kb:np.ndarray, area_b:np.ndarray)->tuple[np.ndarray, np.ndarray]:
+    """(A, B) object keypoint similarity and a mask of pairs that shared any keypoint.
+
+    Only keypoints present (not NaN, confidence > 0) in both poses count;
+    the scale is b's box area, as in COCO evaluation.
+    """
+    ok = ~np.isnan(ka[:, None, :, 0]) & ~np.isnan(kb[None, :, :, 0]) \
+         & (ka[:, None, :, 2] > 0) & (kb[None, :, :, 2] > 0)                   # (A, B, K)
+    d2 = ((ka[:, None, :, :2] - kb[None, :, :, :2]) ** 2).sum(3)
+    var = (2 * OKS_SIGMAS) ** 2 * 2 * np.maximum(area_b, 1e-6)[None, :, None]
+    e = np.where(ok, np.exp(-d2 / var), 0.0)
+    n = ok.sum(2)
+    return e.sum(2) / np.maximum(n, 1), n > 0
+
+def assign(sim:np.ndarray, min_sim:float)->list[tuple[int, int]]:
+    """Maximum-similarity one-to-one (row, col) pairs with sim ≥ min_sim."""
+    if not sim.size: return []
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(-sim)
+        pairs = zip(rows.tolist(), cols.tolist())
+    else:
+        order = np.dstack(np.unravel_index(np.argsort(-sim, None), sim.shape))[0]
+        used_r, used_c, pairs = set(), set(), []
+        for r, c in order.tolist():
+            if r not in used_r and c not in used_c:
+                used_r.add(r); used_c.add(c); pairs.append((r, c))
+    return [(r, c) for r, c in pairs if sim[r, c] >= min_sim]
+
+class Tracker:
+    """Assigns stable ids to the people of consecutive PoseFrames.
+
+    Similarity is iou_weight·IoU + (1 − iou_weight)·OKS against each
+    track's last observation (IoU alone when the pair shares no keypoints),
+    solved as one assignment problem per frame.  A new track is only
+    reported after min_hits consecutive matches (one-frame false positives
+    never reach trails or audio); a reported track that goes unmatched keeps
+    its id and last pose for max_misses frames, so a dropped detection does
+    not end a person.  Detector ids (HAILO_UNIQUE_ID or detection order) are
+    ignored – output ids are the tracker's own.  With a smoother, reported
+    keypoint positions are filtered per track (association still uses the
+    raw observations); with a predictor, frames carry each keypoint's
+    filtered velocity for PoseFrame.predicted(); with
+    kinematics, the derivatives of the reported positions
+    (PoseFrame.kinematics).  Filter state and history live with the track
+    and die with it.
+    """
+    _state = ("ids", "kps", "boxes", "scores", "hits", "misses", "shown", "xy", "dxy", "t",
+              "motion", "cov", "hist", "hist_t")
+
+    def __init__(self, iou_weight:float=0.5, min_sim:float=0.2,
+                 min_hits:int=2, max_misses:int=5, smoother:OneEuro|None=None,
+                 predictor:ConstantVelocity|None=None, kinematics:Kinematics|None=None):
+        self.iou_weight, self.min_sim = iou_weight, min_sim
+        self.min_hits, self.max_misses = min_hits, max_misses
+        self.smoother, self.predictor, self.kinematics = smoother, predictor, kinematics
+        self._next = 0
+        self.reset()
+
+    def reset(self):
+        self.ids    = np.zeros(0, np.int64)
+        self.kps    = np.zeros((0, NUM_KP, 3), np.float32)
+        self.boxes  = np.zeros((0, 4), np.float32)
+        self.scores = np.zeros(0, np.float32)
+        self.hits   = np.zeros(0, np.int32)  # consecutive matches
+        self.misses = np.zeros(0, np.int32)  # consecutive frames unmatched
+        self.shown  = np.zeros(0, bool)      # reached min_hits at some point
+        self.xy     = np.zeros((0, NUM_KP, 2), np.float32)  # reported (smoothed) positions
+        self.dxy    = np.zeros((0, NUM_KP, 2), np.float32)  # their filtered velocity
+        self.t      = np.zeros(0, np.float64)  # time of the last observation
+        self.motion = np.zeros((0, NUM_KP, 4), np.float32)  # predictor state x, y, vx, vy
+        self.cov    = np.zeros((0, NUM_KP, 3), np.float32)  # and its covariance
+        self.hist, self.hist_t = Kinematics().init(np.zeros((0, NUM_KP, 2), np.float32), 0.0)
+
+    def similarity(self, pose:PoseFrame)->np.ndarray:
+        """(tracks, detections) similarity matrix."""
+        iou = iou_matrix(self.boxes, pose.bboxes)
+        b = pose.bboxes
+        oks, shared = oks_matrix(self.kps, pose.keypoints, (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]))
+        w = self.iou_weight
+        return np.where(shared, w * iou + (1 - w) * oks, iou)
+
+    def update(self, pose:PoseFrame)->PoseFrame:
+        """Associate pose's rows with tracks; returns the reported tracks, ids sorted."""
+        t, d = len(self.ids), len(pose)
+        pairs = assign(self.similarity(pose), self.min_sim) if t and d else []
+        ti = np.array([p[0] for p in pairs], np.int64); di = np.array([p[1] for p in pairs], np.int64)
+        matched_t = np.zeros(t, bool); matched_t[ti] = True
+        matched_d = np.zeros(d, bool); matched_d[di] = True
+        # matched tracks take the new observation
+        self.kps[ti], self.boxes[ti], self.scores[ti] = pose.keypoints[di], pose.bboxes[di], pose.scores[di]
+        self.hits[ti] += 1; self.misses[ti] = 0
+        raw, dt = pose.keypoints[di, :, :2], pose.t - self.t[ti]
+        if self.smoother is not None and len(ti):
+            self.xy[ti], self.dxy[ti] = self.smoother(raw, self.xy[ti], self.dxy[ti], dt)
+        else:
+            self.xy[ti] = raw
+        if self.predictor is not None and len(ti):
+            self.motion[ti], self.cov[ti] = self.predictor(raw, self.motion[ti], self.cov[ti], dt)
+        if self.kinematics is not None and len(ti):
+            self.hist[ti], self.hist_t[ti] = self.kinematics.push(self.hist[ti], self.hist_t[ti], self.xy[ti], pose.t)
+        self.t[ti] = pose.t
+        self.hits[~matched_t] = 0; self.misses[~matched_t] += 1
+        # births for unmatched detections
+        nd = np.flatnonzero(~matched_d); nb = len(nd)
+        if nb: self._birth(pose, nd)
+        self.shown |= self.hits >= self.min_hits
+        # deaths: unconfirmed tracks die on their first miss, confirmed ones after max_misses
+        keep = (self.misses == 0) | (self.shown & (self.misses <= self.max_misses))
+        if not keep.all():
+            for name in self._state:
+                setattr(self, name, getattr(self, name)[keep])
+        out = np.flatnonzero(self.shown)
+        if not len(out): return empty_frame(pose.t)
+        out = out[np.argsort(self.ids[out])]
+        kps = np.concatenate((self.xy[out], self.kps[out, :, 2:]), 2)
+        return PoseFrame(kps, self.boxes[out].copy(), self.ids[out].copy(), self.scores[out].copy(), pose.t,
+                         self.kps[out].copy() if self.smoother is not None else None,
+                         self._velocity(out) if self.predictor is not None else None,
+                         self._features(out) if self.kinematics is not None else None)
+
+    def _birth(self, pose:PoseFrame, nd:np.ndarray):
+        nb = len(nd)
+        new_ids = np.arange(self._next, self._next + nb, dtype=np.int64); self._next += nb
+        self.ids    = np.concatenate((self.ids, new_ids))
+        self.kps    = np.concatenate((self.kps, pose.keypoints[nd]))
+        self.boxes  = np.concatenate((self.boxes, pose.bboxes[nd]))
+        self.scores = np.concatenate((self.scores, pose.scores[nd]))
+        self.hits   = np.concatenate((self.hits, np.ones(nb, np.int32)))
+        self.misses = np.concatenate((self.misses, np.zeros(nb, np.int32)))
+        self.shown  = np.concatenate((self.shown, np.zeros(nb, bool)))
+        self.xy     = np.concatenate((self.xy, pose.keypoints[nd, :, :2]))
+        self.dxy    = np.concatenate((self.dxy, np.zeros((nb, NUM_KP, 2), np.float32)))
+        self.t      = np.concatenate((self.t, np.full(nb, pose.t)))
+        motion, cov = (self.predictor or ConstantVelocity()).init(pose.keypoints[nd, :, :2])
+        self.motion = np.concatenate((self.motion, motion))
+        self.cov    = np.concatenate((self.cov, cov))
+        hist, hist_t = (self.kinematics or Kinematics()).init(pose.keypoints[nd, :, :2], pose.t)
+        self.hist   = np.concatenate((self.hist, hist))
+        self.hist_t = np.concatenate((self.hist_t, hist_t))
+
+    def _velocity(self, rows:np.ndarray)->np.ndarray:
+        v = self.predictor.velocity(self.motion[rows])
+        v[self.misses[rows] > 0] = 0         # coasting tracks hold still rather than drift
+        return v
+
+    def _features(self, rows:np.ndarray)->MotionFeatures:
+        f = self.kinematics(self.hist[rows], self.hist_t[rows])
+        coast = self.misses[rows] > 0
+        if coast.any():
+            for arr in f: arr[coast] = 0
+        return f
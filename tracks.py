@@ -0,0 +1,82 @@
+# tracks.py – track lifecycle: enter/leave events and TTL eviction of per-person state
+
+from pose_frame import PoseFrame
+
+class TrackRegistry:
+    """Last-seen time of every track id, and the per-track state that dies with it.
+
+    update(pose) marks the frame's ids as seen; an id unseen for more than
+    ttl seconds (pose time) leaves.  Per-track state lives in slot(tid), a
+    dict dropped on leave, or in containers registered with own() – on
+    leave each loses the id (its drop() if it has one, else pop()).
+    on_enter/on_leave listeners get the id.  Memory and per-frame work are
+    bounded by the people seen in the last ttl seconds, not by everyone
+    seen since start.
+    """
+    def __init__(self, ttl:float=2.0):
+        self.ttl    = ttl
+        self._seen  = {}           # tid → last pose.t
+        self._slots = {}           # tid → {name: state}
+        self._owned = []
+        self._enter, self._leave = [], []
+
+    def __contains__(self, tid):
+        return tid in self._seen
+
+    def __iter__(self):
+        return iter(self._seen)
+
+    def __len__(self):
+        return len(self._seen)
+
+    def own(self, container):
+        """Register a tid-keyed container for eviction; returns it."""
+        self._owned.append(container)
+        return container
+
+    def replace(self, old, new)->bool:
+        """Own new in place of old; False if old was not owned."""
+        for i, c in enumerate(self._owned):
+            if c is old: self._owned[i] = new; return True
+        return False
+
+    def adopt(self, other:"TrackRegistry"):
+        """Take over other's seen ids and slots (a hot-reloaded visual), so
+        state carried with them still expires."""
+        self._seen.update(other._seen)
+        self._slots.update(other._slots)
+
+    def on_enter(self, fn):
+        self._enter.append(fn)
+
+    def on_leave(self, fn):
+        self._leave.append(fn)
+
+    def slot(self, tid)->dict:
+        """Free-form state of tid, created empty; gone after tid leaves."""
+        return self._slots.setdefault(tid, {})
+
+    def update(self, pose:PoseFrame)->tuple[list, list]:
+        """Mark pose's ids seen and evict expired ones; returns (entered, left)."""
+        t, seen = pose.t, self._seen
+        ids = pose.ids.tolist()
+        entered = [tid for tid in ids if tid not in seen]
+        for tid in ids: seen[tid] = t
+        left = [tid for tid, s in seen.items() if t - s > self.ttl]
+        for tid in left: self.evict(tid)
+        for tid in entered:
+            for fn in self._enter: fn(tid)
+        return entered, left
+
+    def evict(self, tid):
+        """Forget tid and all its state now."""
+        if self._seen.pop(tid, None) is None: return
+        self._slots.pop(tid, None)
+        for c in self._owned:
+            drop = getattr(c, "drop", None)
+            if drop is not None: drop(tid)
+            else: c.pop(tid, None)
+        for fn in self._leave: fn(tid)
+
+    def clear(self):
+        for tid in list(self._seen): self.evict(tid)
@@ -0,0 +1,102 @@
+# trail_buffer.py – fixed-capacity NumPy ring for keypoint trails
+
+import math
+import numpy as np
+
+def to_screen(pts:np.ndarray, w:int, h:int, out:np.ndarray|None=None)->np.ndarray:
+    """(n, 2) normalised points → int32 pixel coords."""
+    if out is None: out = np.empty(pts.shape, np.int32)
+    np.multiply(pts, (w, h), out=out, casting="unsafe")
+    return out
+
+class TrailBuffer:
+    """Ring of normalised (x, y) points with O(1) append.
+
+    Every point is written twice (at i and i+capacity), so the ordered
+    history is always the contiguous slice buf[head:head+n] – view() never
+    copies, and to_screen() is one multiply into a reused int32 array.
+    """
+    __slots__ = ("capacity", "_buf", "_head", "_n", "_screen")
+
+    def __init__(self, capacity:int):
+        self.capacity = capacity
+        self._buf     = np.zeros((2 * capacity, 2), np.float32)
+        self._head    = 0          # index of the oldest point
+        self._n       = 0
+        self._screen  = np.zeros((capacity, 2), np.int32)
+
+    def __len__(self):
+        return self._n
+
+    def append(self, x:float, y:float):
+        cap = self.capacity
+        i = (self._head + self._n) % cap
+        self._buf[i] = self._buf[i + cap] = (x, y)
+        if self._n < cap: self._n += 1
+        else: self._head = (self._head + 1) % cap
+
+    def extend(self, pts):
+        """Append an (M, 2) array of points (keeps the newest `capacity`)."""
+        pts = np.asarray(pts, np.float32).reshape(-1, 2)[-self.capacity:]
+        cap, m = self.capacity, len(pts)
+        idx = (self._head + self._n + np.arange(m)) % cap
+        self._buf[idx] = self._buf[idx + cap] = pts
+        over = max(0, self._n + m - cap)
+        self._n = min(cap, self._n + m); self._head = (self._head + over) % cap
+
+    def view(self)->np.ndarray:
+        """Oldest→newest (n, 2) read-only view, valid until the next append."""
+        v = self._buf[self._head:self._head + self._n]
+        v.flags.writeable = False
+        return v
+
+    def to_screen(self, w:int, h:int)->np.ndarray:
+        """(n, 2) int32 pixel coords, ready for pygame.draw.lines; reused between calls."""
+        return to_screen(self.view(), w, h, self._screen[:self._n])
+
+    def freeze(self)->np.ndarray:
+        """Read-only copy of the ordered history, safe to hand to another thread."""
+        v = self.view().copy()
+        v.flags.writeable = False
+        return v
+
+class TrailMap:
+    """TrailBuffers keyed by (track id, keypoint), created on first use."""
+    def __init__(self, capacity:int):
+        self.capacity = capacity
+        self._trails  = {}         # tid → {kp: TrailBuffer}
+
+    def __contains__(self, tid):
+        return tid in self._trails
+
+    def __iter__(self):
+        return iter(self._trails)
+
+    def __len__(self):
+        return len(self._trails)
+
+    def track(self, tid)->dict:
+        """{kp: TrailBuffer} for tid (created empty if unseen)."""
+        return self._trails.setdefault(tid, {})
+
+    def get(self, tid, kp)->TrailBuffer:
+        t = self.track(tid)
+        buf = t.get(kp)
+        if buf is None: buf = t[kp] = TrailBuffer(self.capacity)
+        return buf
+
+    def push(self, tid, keypoints, kps):
+        """Append keypoints[k, :2] to the (tid, k) trail for every k in kps that is present."""
+        for k in kps:
+            x, y = float(keypoints[k, 0]), float(keypoints[k, 1])
+            if math.isfinite(x) and math.isfinite(y): self.get(tid, k).append(x, y)
+
+    def items(self):
+        return self._trails.items()
+
+    def drop(self, tid):
+        self._trails.pop(tid, None)
+
+    def freeze(self)->dict:
+        """{tid: {kp: frozen (n, 2) array}} snapshot of every trail."""
+        return {tid: {kp: buf.freeze() for kp, buf in t.items()} for tid, t in self._trails.items()}
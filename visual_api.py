@@ -0,0 +1,109 @@
+# visual_api.py – the Visual plugin protocol: pose-rate state updates, display-rate rendering
+
+import collections, threading, time
+from pose_frame import PoseFrame, get_pose_frame
+from scheduler import PoseClock
+from tracks import TrackRegistry
+
+class Visual:
+    """Base class of the visuals in multi_person_visuals/.
+
+    Subclasses declare which keypoints they read and split their work:
+      on_pose_frame(pose)  once per inference frame, in order – cheap
+                           state updates (trails, colours, density grids)
+      render(surface, t)   whenever the panel is redrawn – drawing only;
+                           t is time.monotonic()
+      resize(w, h)         optional, when the panel size changes
+      animating()          optional, True while render() changes with t alone
+    The data thread only queues poses with feed(), so it never waits for a
+    redraw; sync() (the render loop, once per tick) and draw() apply the
+    queue before anything reads the state, so on_pose_frame() and render()
+    run on the same thread and a subclass never sees its state half-updated.
+    pose_at(t) is the newest pose resampled to t (see scheduler.PoseClock)
+    for visuals that draw people directly instead of accumulated state – by
+    default predicted along the tracker's keypoint velocities, at most
+    horizon seconds past capture.  pose_mode and horizon are class
+    attributes the app sets once on Visual, so every plugin resamples the
+    way the app's dirty tracking expects.  Fed poses hold smoothed keypoints;
+    pose.raw() and pose.predicted(t) give the other two trade-offs.
+    Per-person state belongs in self.tracks (see tracks.TrackRegistry):
+    containers made with self.tracks.own({}) lose a person's entry
+    track_ttl seconds after they were last seen; `stale` then stays True
+    until the next draw, so the app redraws even when no one is in view.
+    """
+    required_keypoints: tuple = ()     # COCO indices, see KEYPOINTS; () = all
+    track_ttl: float = 2.0             # seconds a departed person's state is kept
+    pose_mode: str = "predict"         # see scheduler.PoseClock
+    horizon: float = 0.1               # furthest (s) pose_at() projects past capture
+
+    def __init__(self):
+        self._lock  = threading.Lock()
+        self._clock = PoseClock(self.pose_mode, self.horizon)
+        self._size  = None
+        self.tracks = TrackRegistry(self.track_ttl)
+        self._stale = False        # state evicted since the last draw
+        self._inbox = collections.deque(maxlen=64)   # (pose, arrival) fed, not yet applied
+
+    # ── framework side ──
+    def feed(self, pose:PoseFrame):
+        """Queue pose for the next sync() or draw(); cheap enough for the pad probe."""
+        self._inbox.append((pose, time.monotonic()))
+
+    def sync(self):
+        """Apply every queued pose: clock, track registry, on_pose_frame()."""
+        with self._lock:
+            self._apply()
+
+    def _apply(self):
+        inbox = self._inbox
+        while inbox:
+            pose, arrived = inbox.popleft()
+            self._clock.push(pose, arrived)
+            _, left = self.tracks.update(pose)
+            if left: self._stale = True
+            self.on_pose_frame(pose)
+
+    def draw(self, surface, t:float):
+        with self._lock:
+            self._apply()
+            size = surface.get_size()
+            if size != self._size:
+                self._size = size
+                self.resize(*size)
+            self.render(surface, t)
+            self._stale = False
+
+    def visualize(self, user_data, surface):
+        """Legacy entry point (TEST.py, AV*.py, AUDIO*.py): feed and draw in one call."""
+        self.feed(get_pose_frame(user_data))
+        self.draw(surface, time.monotonic())
+
+    @property
+    def stale(self)->bool:
+        """True when fed state changed without a pose worth redrawing for (evictions)."""
+        return self._stale
+
+    def pose_at(self, t:float)->PoseFrame:
+        return self._clock.sample(t)
+
+    def moving(self, t:float)->bool:
+        """Would pose_at(t) differ from the newest fed pose (see PoseClock.moving)?"""
+        return self._clock.moving(t)
+
+    @property
+    def pose(self)->PoseFrame:
+        """Newest pose frame fed (EMPTY before the first)."""
+        return self._clock.cur
+
+    # ── plugin side ──
+    def on_pose_frame(self, pose:PoseFrame):
+        pass
+
+    def render(self, surface, t:float):
+        raise NotImplementedError
+
+    def resize(self, w:int, h:int):
+        pass
+
+    def animating(self)->bool:
+        return False
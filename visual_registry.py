@@ -0,0 +1,185 @@
+# visual_registry.py – cached manifest of visual plugins, imported lazily on first selection
+
+import ast, importlib.util, json, os, threading
+from typing import NamedTuple
+from tracks import TrackRegistry
+
+MANIFEST     = ".manifest.json"
+SUFFIX       = "Visual.py"
+DEFAULT_ORDER = 1000               # plugins without ORDER go last, by name
+
+class VisualInfo(NamedTuple):
+    name: str                      # "FeetHeatmap"
+    path: str|None                 # plugin file, None for built-ins
+    order: int
+    sound: str                     # WAV file name in the sound directory
+    required_keypoints: tuple      # () = not declared
+
+def read_meta(path:str)->dict:
+    """Module-level ORDER / REQUIRED_KEYPOINTS / SOUND literals, without importing."""
+    with open(path) as f: tree = ast.parse(f.read(), path)
+    meta = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            key = node.targets[0].id
+            if key in ("ORDER", "REQUIRED_KEYPOINTS", "SOUND"):
+                try: meta[key] = ast.literal_eval(node.value)
+                except ValueError: pass
+    return meta
+
+def scan(directory:str)->list[VisualInfo]:
+    """Plugins in directory sorted by (order, name); the manifest is rebuilt per file on mtime/size change."""
+    cache_path = os.path.join(directory, MANIFEST)
+    try:
+        with open(cache_path) as f: cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    entries, changed = {}, False
+    for fn in sorted(os.listdir(directory)):
+        if not fn.endswith(SUFFIX): continue
+        p = os.path.join(directory, fn); st = os.stat(p)
+        e = cache.get(fn)
+        if not e or e["mtime_ns"] != st.st_mtime_ns or e["size"] != st.st_size:
+            try: meta = read_meta(p)
+            except (OSError, SyntaxError) as err:
+                print("[visuals]", fn, err); continue
+            name = fn[:-len(SUFFIX)]
+            e = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "name": name,
+                 "order": int(meta.get("ORDER", DEFAULT_ORDER)),
+                 "sound": meta.get("SOUND", name + "Visual.wav"),
+                 "required_keypoints": list(meta.get("REQUIRED_KEYPOINTS", ()))}
+            changed = True
+        entries[fn] = e
+    if changed or entries.keys() != cache.keys():
+        try:
+            with open(cache_path, "w") as f: json.dump(entries, f, indent=1)
+        except OSError as err:
+            print("[visuals] cannot write manifest:", err)
+    infos = [VisualInfo(e["name"], os.path.join(directory, fn), e["order"], e["sound"],
+                        tuple(e["required_keypoints"])) for fn, e in entries.items()]
+    return sorted(infos, key=lambda i: (i.order, i.name))
+
+def import_visual(path:str):
+    """Fresh module object for a plugin file (not entered in sys.modules)."""
+    name = os.path.basename(path)[:-3]
+    spec = importlib.util.spec_from_file_location(name, path)
+    m = importlib.util.module_from_spec(spec); spec.loader.exec_module(m)
+    return m
+
+def carry_state(old, new):
+    """Hand a reloaded visual the state of the instance it replaces.
+
+    new.restore_state(old) decides if the plugin defines it.  Otherwise a
+    public attribute is carried when the fresh instance starts it as an
+    empty container (per-track dicts, TrailMaps, …) and the old one has the
+    same type and capacity – accumulated state survives, while edited
+    constants, sizes and configuration take effect.  The fresh track
+    registry is kept (containers the edited plugin newly owns stay owned);
+    carried containers replace their fresh counterparts in it, and it
+    adopts the old one's ids so their state still expires.
+    """
+    f = getattr(new, "restore_state", None)
+    if f is not None: f(old); return
+    shape = lambda c: (type(c), getattr(c, "capacity", None), getattr(c, "maxlen", None))
+    tracks = getattr(new, "tracks", None)
+    if not isinstance(tracks, TrackRegistry): tracks = None
+    fresh = vars(new)
+    for k, v in vars(old).items():
+        nv = fresh.get(k)
+        if k.startswith("_") or nv is None or nv is tracks or shape(nv) != shape(v): continue
+        try:
+            if len(nv): continue
+        except TypeError:          # no len() → not a container
+            continue
+        setattr(new, k, v)
+        if tracks is not None: tracks.replace(nv, v)
+    if tracks is not None and isinstance(getattr(old, "tracks", None), TrackRegistry):
+        tracks.adopt(old.tracks)
+
+class VisualRegistry:
+    """Ordered visuals; each one is imported and instantiated on first get().
+
+    Startup only stats the plugin files (the manifest supplies names, order,
+    sounds and keypoints), so nothing delays the Hailo pipeline.  warm()
+    imports the rest in a background thread, in cycle order, and hands each
+    info to an optional callback for asset warm-up (PCM, loudness).
+    reload() swaps a re-imported plugin into its slot.
+    """
+    def __init__(self, directory:str):
+        self.directory = directory
+        self.infos     = []
+        self.instances = []        # None until imported
+        self._factories = {}       # built-in name → factory
+        self._lock     = threading.Lock()
+        if os.path.isdir(directory):
+            for info in scan(directory): self._append(info)
+
+    def _append(self, info:VisualInfo):
+        self.infos.append(info); self.instances.append(None)
+
+    def add_builtin(self, name:str, factory, order:int=0, sound:str|None=None, required_keypoints=()):
+        """Register a visual defined in the app itself, keeping the (order, name) sort."""
+        self._factories[name] = factory
+        self._append(VisualInfo(name, None, order, sound or name.replace(" ", "") + "Visual.wav",
+                                tuple(required_keypoints)))
+        pairs = sorted(zip(self.infos, self.instances), key=lambda p: (p[0].order, p[0].name))
+        self.infos, self.instances = [p[0] for p in pairs], [p[1] for p in pairs]
+
+    def __len__(self):
+        return len(self.infos)
+
+    @property
+    def names(self)->list[str]:
+        return [i.name for i in self.infos]
+
+    def _create(self, info:VisualInfo):
+        if info.path is None: return self._factories[info.name]()
+        return import_visual(info.path).VisualClass()
+
+    def get(self, i:int):
+        v = self.instances[i]
+        if v is not None: return v
+        with self._lock:           # main thread and warm() may race for the same plugin
+            v = self.instances[i]
+            if v is None:
+                v = self.instances[i] = self._create(self.infos[i])
+        return v
+
+    def reload(self, path:str)->int|None:
+        """Re-import the plugin at path and swap in a new instance; its index, or None.
+
+        A plugin that fails to import or construct keeps its running version.
+        The slot (and so the cycle position) is kept until restart; a file
+        not seen before is appended.
+        """
+        fn = os.path.basename(path)
+        info = next((i for i in scan(self.directory) if os.path.basename(i.path) == fn), None)
+        if info is None: return None
+        try:
+            new = import_visual(info.path).VisualClass()
+        except Exception as err:
+            print("[visuals] reload of", fn, "failed, keeping the running version:", err)
+            return None
+        with self._lock:
+            idx = next((k for k, i in enumerate(self.infos)
+                        if i.path and os.path.basename(i.path) == fn), None)
+            if idx is None:
+                self._append(info); idx = len(self.infos) - 1
+            else:
+                old = self.instances[idx]
+                if old is not None: carry_state(old, new)
+                self.infos[idx] = info._replace(order=self.infos[idx].order)
+            self.instances[idx] = new      # single reference swap
+        return idx
+
+    def warm(self, on_info=None)->threading.Thread:
+        def run():
+            for i, info in enumerate(self.infos):
+                try:
+                    self.get(i)
+                    if on_info: on_info(info)
+                except Exception as err:     # a broken plugin must not kill the app
+                    print("[visuals] warm-up failed for", info.name, err)
+        t = threading.Thread(target=run, name="visual-warmup", daemon=True)
+        t.start()
+        return t